@@ -1,7 +1,7 @@
-import pygame
-
 from pygame.sprite import Sprite
 
+from assets import get_sprite_size
+
 
 class Alien(Sprite):
     """A class to represent a single alien in the fleet."""
@@ -10,18 +10,20 @@ class Alien(Sprite):
         super().__init__()
         self.screen = ai_game.screen
         self.settings = ai_game.settings
+        self.assets = ai_game.assets
 
         # Set the alien width and height to a percentage of the screen rect's 
         # width and height. This allows the alien image to scale 
         # up and down between screen resolutions.       
-        self.alien_width = self.screen.get_rect().width * .035
-        self.alien_height = self.screen.get_rect().height * .048
+        path = 'Images/alien-medium.png'
+        self.alien_width, self.alien_height = get_sprite_size(
+            path, self.screen.get_rect())
 
-        # Load the alien image and set its scale and rect attribute. 
-        self.image = pygame.image.load('images/alien-medium.png')
-        self.image = pygame.transform.scale(self.image, (
-            self.alien_width, self.alien_height))
+        # Get the scaled alien image from the asset cache and set its rect.
+        self.image = self.assets.get_image(
+            path, (self.alien_width, self.alien_height))
         self.rect = self.image.get_rect()
+        self.mask = self.assets.get_mask(self.image)
 
         # Start each new alien near the top left of the screen.
         self.rect.x = self.rect.width
@@ -30,15 +32,39 @@ class Alien(Sprite):
         # Store the alien's exact horizontal position.
         self.x = float(self.rect.x)
 
+        # Position before the last update, used to interpolate drawing.
+        self.old_pos = None
+
+        # The formation indexing this alien, and its place in it.
+        self.formation = None
+        self.column = None
+        self.row = None
+
+    def kill(self):
+        """Remove the alien from all groups and its formation."""
+        super().kill()
+        self._leave_fleet()
+
+    def remove_internal(self, group):
+        super().remove_internal(group)
+        if not self.alive():
+            self._leave_fleet()
+
+    def _leave_fleet(self):
+        """Take the alien out of its formation, if any."""
+        if self.formation is not None:
+            self.formation.remove(self)
+
     def _change_alien_image(self):
-        self.image = pygame.image.load('images/boss2.png')
+        self.image = self.assets.get_image('Images/boss2.png')
         self.rect = self.image.get_rect()
+        self.mask = self.assets.get_mask(self.image)
 
-    def update(self):
+    def update(self, dt):
         """Move the alien to the right."""
-        self.mask = pygame.mask.from_surface(self.image)
+        self.old_pos = self.rect.topleft
         self.x += (self.settings.alien_speed *
-                   self.settings.fleet_direction)
+                   self.settings.fleet_direction * dt)
         self.rect.x = self.x
 
     def check_edges(self):
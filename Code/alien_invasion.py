@@ -1,40 +1,188 @@
-import pygame
+import argparse
+import os
+import random
 import sys
-from time import sleep
+import time
+
+# When the game's imports started, for the startup profile.
+IMPORT_START = time.perf_counter()
+
+import pygame
 
 from alien import Alien
+from asset_loader import AssetLoader
+from assets import AssetManager
 from bullet import Bullet, AlienBullet
 from button import Button
-from explosion import Explosion
+from effects import Explosions
+from fleet import ArrayFleet
+from formation import Formation
+from game_clock import GameClock, interpolate, interpolated_blits
+from game_state import (GameStateMachine, MENU, COUNTDOWN, PLAYING,
+                        LEVEL_TRANSITION, RESPAWN, GAME_OVER)
 from game_stats import GameStats
+from pool import SpritePool
+from renderer import Renderer
+from replay import Recorder, get_settings_snapshot
+from profiler import FrameProfiler
 from scoreboard import Scoreboard
 from settings import Settings
+from spatial_hash import SpatialHash
 from ship import Ship
+from sound_bank import SoundBank
+
+# Seconds spent importing pygame and the game's modules.
+IMPORT_TIME = time.perf_counter() - IMPORT_START
 
 
 class AlienInvasion:
     """Overall class to manage game assets and behavior."""
 
-    def __init__(self):
-        """Initialize the game and create game resources."""
-        pygame.init()
-        self.settings = Settings()
-
-        self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    def __init__(self, headless=False, seed=None, render=True,
+                 resolution=None, overrides=None, windowed=False):
+        """
+        Initialize the game and start loading its assets. A headless game
+        uses dummy video and audio drivers, loads everything before
+        returning, never holds still between states, and can be advanced
+        one tick at a time with step(). Set render to False to skip drawing.
+        overrides is a dict of settings to change before anything is built.
+        The game is drawn at resolution, 1280x720 by default, and scaled to
+        fill the screen, or shown at that size in a window if windowed.
+        """
+        # Seconds taken by each stage of startup, for the startup report.
+        self.startup_times = {'import': IMPORT_TIME}
+        self.startup_start = time.perf_counter()
+
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
+        self._init_pygame()
+
+        start = time.perf_counter()
+        self.settings = Settings(headless, resolution, windowed)
+        self.startup_times['set_mode'] = time.perf_counter() - start
+        for name, value in (overrides or {}).items():
+            setattr(self.settings, name, value)
+
+        # The settings as they were at launch, restored by restart(), and
+        # the settings restart() was last asked to change.
+        self.initial_settings = get_settings_snapshot(self.settings)
+        self.overrides = {}
+        self.render = render
+
+        # The canvas everything is drawn on, in game coordinates.
+        self.screen = self.settings.screen
+
+        # Seeded random number generator for everything that needs chance,
+        # so headless runs can be reproduced.
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.random = random.Random(seed)
+
+        # Records every frame's input when set. While replaying, events
+        # come from replay_events instead of the event queue.
+        self.recorder = None
+        self.replaying = False
+        self.replay_events = []
 
         pygame.display.set_caption("Alien Invasion")
 
+        # Image cache, and the sound bank with its mixer channels reserved.
+        # Both are filled by the loaders below.
+        self.assets = AssetManager()
+        self.sounds = SoundBank(load=False)
+
+        # Fixed timestep clock for the simulation and the render cap.
+        self.clock = GameClock(self.settings.tick_rate, self.settings.max_fps)
+
+        # Which state the game is in, e.g. on the menu or between levels.
+        self.state = GameStateMachine(MENU)
+
+        # Draws each frame, either in full or only the changed areas, and
+        # scales it to the display.
+        self.renderer = Renderer(self)
+
+        # Assets needed for the first frame are loaded behind a progress
+        # screen. The rest are prefetched while the menu is up. A prefetch
+        # that fails is loaded again when it is first used, so one bad file
+        # doesn't stop the others being prefetched.
+        self.loader = AssetLoader()
+        self.prefetcher = AssetLoader(keep_going=True)
+        self._add_loading_jobs()
+        self.startup_times['init'] = time.perf_counter() - self.startup_start
+
+        if self.settings.headless:
+            self.loader.run()
+            self._finish_loading()
+
+    def _init_pygame(self):
+        """
+        Start only the pygame modules the game uses, timing each one. The
+        game plays silently if there is no audio device.
+        """
+        for name, init in (('display', pygame.display.init),
+                           ('font', pygame.font.init),
+                           ('mixer', pygame.mixer.init)):
+            start = time.perf_counter()
+            try:
+                init()
+            except pygame.error:
+                if name != 'mixer':
+                    raise
+            self.startup_times[name] = time.perf_counter() - start
+
+    def _add_loading_jobs(self):
+        """Queue up the startup and prefetch loading jobs."""
+        assets = self.assets
+        screen_rect = self.screen.get_rect()
+
+        # Cut sprites from the packed atlas if it has been built.
+        self.loader.add('atlas', assets.load_atlas)
+        self.loader.add('background', assets.get_background,
+                        screen_rect.size)
+        for path, size in assets.get_startup_images(screen_rect):
+            self.loader.add(self._get_job_name(path, size), assets.get_image,
+                            path, size)
+        self.loader.add('fonts', assets.get_font, 48)
+
+        for path, size in assets.get_later_images():
+            self.prefetcher.add(self._get_job_name(path, size),
+                                assets.get_image, path, size)
+        # The game over sound is the largest effect, so decode it first.
+        names = self.sounds.get_names()
+        names.sort(key=lambda name: name != 'game_over')
+        for name in names:
+            self.prefetcher.add(name, self.sounds.load, name)
+
+    def _get_job_name(self, path, size):
+        """Name an image loading job by its path and whole pixel size."""
+        if size is None:
+            return path
+        return f'{path} {int(size[0])}x{int(size[1])}'
+
+    def _finish_loading(self):
+        """Create the game objects once the startup assets are loaded."""
+        start = time.perf_counter()
+        self.loader.wait()
+        self.startup_times['loading'] = self.loader.get_total_time()
+
+        self.settings.bg = self.assets.get_background(self.screen.get_size())
+        self.settings.bg_rect = self.settings.bg.get_rect()
+
         # Create an instance to store game stats and create a scoreboard
         self.stats = GameStats(self)
         self.sb = Scoreboard(self)
 
         self.ship = Ship(self)
         self.bullets = pygame.sprite.Group()
-        self.aliens = pygame.sprite.Group()
-        self.explosions = pygame.sprite.Group()
+        self.aliens = self._make_fleet_group()
+        self.explosions = Explosions(self)
         self.alien_bullets = pygame.sprite.Group()
 
-        self._create_fleet()
+        # The fleet's column and row index. The fleet itself is created
+        # when a game starts.
+        self.formation = None
 
         # Make the Play button.
         self.play_button = Button(self, "Play")
@@ -42,23 +190,238 @@ class AlienInvasion:
         # Make difficulty level buttons.
         self._make_difficulty_buttons()
 
+        # Pools of reusable bullets.
+        self.bullet_pool = SpritePool(lambda: Bullet(self))
+        self.alien_bullet_pool = SpritePool(lambda: AlienBullet(self, 0, 0))
+        self._reserve_pools()
+
+        # Broadphase grids for the bullet collision checks.
+        self._make_collision_grids()
+
+        # Frame profiler, toggled with F3. F4 saves its frames to CSV.
+        self.profiler = FrameProfiler(self)
+
+        self.startup_times['setup'] = time.perf_counter() - start
+
+        # Headless games load everything up front so runs are repeatable.
+        if self.settings.headless:
+            self.prefetcher.run()
+        else:
+            self.prefetcher.start()
+
+    def _make_fleet_group(self):
+        """Return an empty group of the fleet backend's kind."""
+        if self.settings.fleet_backend == 'array':
+            return ArrayFleet(self)
+        return pygame.sprite.Group()
+
+    def _make_collision_grids(self):
+        """Make the broadphase grids for the bullet collision checks."""
+        self.alien_grid = SpatialHash(self.settings.collision_cell_size)
+        self.alien_bullet_grid = SpatialHash(
+            self.settings.collision_cell_size)
+
+    def _run_loading_screen(self):
+        """Draw loading progress until the startup assets are ready."""
+        self.loader.start()
+        while not self.loader.is_done():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    sys.exit()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_q:
+                    sys.exit()
+            self._draw_loading_screen()
+            self.clock.tick()
+        self._finish_loading()
+        self.clock.reset()
+
+    def _draw_loading_screen(self):
+        """Draw a progress bar in the middle of the screen."""
+        bar = pygame.Rect(0, 0, self.screen.get_width() // 3, 20)
+        bar.center = self.screen.get_rect().center
+        filled = bar.copy()
+        filled.width = int(bar.width * self.loader.get_progress())
+
+        self.screen.fill((0, 0, 0))
+        pygame.draw.rect(self.screen, (8, 80, 128), filled)
+        pygame.draw.rect(self.screen, (255, 255, 255), bar, 2)
+        self.renderer.flip()
+
+    def get_startup_report(self):
+        """Return the seconds spent in each stage of startup and loading."""
+        report = dict(self.startup_times)
+        report['jobs'] = dict(self.loader.timings)
+        report['prefetch'] = dict(self.prefetcher.timings)
+        return report
+
+    def _print_startup_report(self):
+        """
+        Print how long each stage of startup took: importing, starting
+        pygame and the display, loading assets, slowest job first, and
+        setting up the game.
+        """
+        report = self.get_startup_report()
+        print("Startup profile:")
+        stages = (('import', 'import'), ('init', 'init'),
+                  ('  display', 'display'), ('  font', 'font'),
+                  ('  mixer', 'mixer'), ('  set_mode', 'set_mode'),
+                  ('assets', 'loading'))
+        for label, stage in stages:
+            if stage in report:
+                print(f"  {label:<12} {report[stage] * 1000:8.1f} ms")
+        jobs = sorted(report['jobs'].items(), key=lambda job: -job[1])
+        for name, seconds in jobs:
+            print(f"    {name:<30} {seconds * 1000:8.1f} ms")
+        for stage in ('setup', 'first_frame'):
+            if stage in report:
+                print(f"  {stage:<12} {report[stage] * 1000:8.1f} ms")
+        if 'first_frame' in report:
+            total = report['import'] + report['first_frame']
+            print(f"  {'total':<12} {total * 1000:8.1f} ms")
+
     def run_game(self):
         """Start the main loop for the game."""
+        # Headless games run as fast as possible.
+        if self.settings.headless:
+            while True:
+                self.step()
+
+        self._run_loading_screen()
+
+        # Draw the first interactive frame and note how long it took to get
+        # there from launch.
+        self._run_frame(0)
+        self.startup_times['first_frame'] = (
+            time.perf_counter() - self.startup_start)
+        if self.settings.startup_report:
+            self._print_startup_report()
+
         while True:
-            self._check_events()
+            ticks = self.clock.tick()
+            self._run_frame(ticks, self.clock.alpha)
 
-            if self.stats.game_active:
-                self.ship.update()
-                self._update_bullets()
-                self._update_aliens()
-                self._update_alien_bullets()
-                self.explosions.update()
+    def step(self, ticks=1):
+        """
+        Process pending events and advance the game by ticks simulation
+        steps without waiting on the clock, then draw the result.
+        """
+        self._run_frame(ticks, render=self.render)
+
+    def _run_frame(self, ticks, alpha=1.0, render=True):
+        """Handle events, run ticks simulation steps and draw one frame."""
+        if self.recorder is not None:
+            self.recorder.start_frame(ticks)
+
+        profiler = self.profiler
+        profiler.start_frame()
+        profiler.time('check_events', self._check_events)
+        for _ in range(ticks):
+            self._update_tick()
+        if render:
+            profiler.time('screen', self._update_screen, alpha)
+        profiler.end_frame()
+
+    def _update_tick(self):
+        """Run one simulation tick and advance the event timers."""
+        dt = self.clock.dt
+        if self.state.state == PLAYING:
+            self._update_game(dt)
+        else:
+            # Let explosions play out while the game is held still or over.
+            self.profiler.time('explosions', self.explosions.update, dt)
+        self._update_state(dt)
+
+    def _update_state(self, dt):
+        """Advance the event timers and the current state's timer."""
+        # Aliens hold their fire while the game is held still.
+        if not self.state.is_paused():
+            self.clock.update_timers()
+        self.state.update(dt)
+
+    def _update_game(self, dt):
+        """
+        Advance the game simulation by one fixed timestep of dt seconds,
+        timing each phase when the profiler is on.
+        """
+        time_phase = self.profiler.time
+        time_phase('ship', self.ship.update, dt)
+        time_phase('bullets', self._update_bullets, dt)
+        time_phase('aliens', self._update_aliens, dt)
+        time_phase('alien_bullets', self._update_alien_bullets, dt)
+        time_phase('explosions', self.explosions.update, dt)
+
+    def restart(self, overrides=None):
+        """
+        Put the game back on the menu as it was at launch, reusing the
+        window and loaded assets. overrides is a dict of settings to change.
+        They are kept over the difficulty presets until the next restart.
+        """
+        built = {name: getattr(self.settings, name) for name in (
+            'tick_rate', 'max_fps', 'fleet_backend', 'collision_cell_size',
+            'max_effects')}
+        self.overrides = dict(overrides or {})
+        settings = dict(self.initial_settings)
+        settings.update(self.overrides)
+        for name, value in settings.items():
+            setattr(self.settings, name, value)
+        self._reset_dynamic_settings()
+        self._rebuild_for_settings(built)
+
+        self.clock.clear_timers()
+        pygame.event.clear()
+        self.aliens.empty()
+        self.bullets.empty()
+        self.alien_bullets.empty()
+        self.explosions.empty()
+        self.formation = None
 
-            self._update_screen()
+        self.stats.reset_stats()
+        self.stats.game_active = False
+        self.stats.boss_beaten = False
+        self.stats.load_high_score()
+        self.state.enter(MENU)
+
+        self.ship.moving_right = False
+        self.ship.moving_left = False
+        self.ship.center_ship()
+        self._reserve_pools()
+
+        self.sb.prep_score()
+        self.sb.prep_high_score()
+        self.sb.prep_level()
+        self.sb.prep_ships()
+
+    def _rebuild_for_settings(self, built):
+        """
+        Rebuild the objects that only read their settings when created, if
+        those settings have changed since. built holds the old values.
+        """
+        changed = {name for name, value in built.items()
+                   if getattr(self.settings, name) != value}
+        if changed & {'tick_rate', 'max_fps'}:
+            event_queue = self.clock.event_queue
+            self.clock = GameClock(self.settings.tick_rate,
+                                   self.settings.max_fps)
+            self.clock.event_queue = event_queue
+        if 'fleet_backend' in changed:
+            self.aliens = self._make_fleet_group()
+        if 'collision_cell_size' in changed:
+            self._make_collision_grids()
+        if 'max_effects' in changed:
+            self.explosions = Explosions(self)
+
+    def _reset_dynamic_settings(self):
+        """Reset the difficulty's presets, then apply restart() overrides."""
+        self.settings.initialize_dynamic_settings()
+        for name, value in self.overrides.items():
+            setattr(self.settings, name, value)
 
     def _start_game(self):
         # Reset the game settings.
-        self.settings.initialize_dynamic_settings()
+        self._reset_dynamic_settings()
+
+        # Make sure the pools can cover this difficulty's bullet limits.
+        self._reserve_pools()
 
         # Reset statistics
         self.stats.reset_stats()
@@ -81,14 +444,23 @@ class AlienInvasion:
         self.ship.center_ship()
 
         # Play the game music
-        pygame.mixer.music.load('Sounds/game_music.mp3')
-        pygame.mixer.music.play(-1)
+        self.sounds.play_music('Sounds/game_music.mp3')
 
         # Hide the mouse cursor.
         pygame.mouse.set_visible(False)
 
-        # Pause for the music countdown
-        sleep(2.0)
+        # Hold still for the music countdown.
+        self.state.enter(COUNTDOWN, self.settings.countdown_time,
+                         self._resume_play)
+
+    def _resume_play(self):
+        """Carry on playing once a countdown, transition or respawn ends."""
+        self.state.enter(PLAYING)
+
+    def _reserve_pools(self):
+        """Pre-allocate enough pooled sprites for the current bullet limits."""
+        self.bullet_pool.reserve(self.settings.bullets_allowed)
+        self.alien_bullet_pool.reserve(self.settings.alien_bullets_allowed)
 
     def _make_difficulty_buttons(self):
         """Make buttons that allow player to select difficulty level."""
@@ -115,9 +487,9 @@ class AlienInvasion:
 
     def _check_events(self):
         """Respond to keypresses and mouse events."""
-        for event in pygame.event.get():
+        for event in self._get_events():
             if event.type == pygame.QUIT:
-                sys.exit()
+                self._exit_game()
 
             elif event.type == pygame.KEYDOWN:
                 self._check_keydown_events(event)
@@ -126,14 +498,43 @@ class AlienInvasion:
                 self._check_keyup_events(event)
 
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
-                self._check_play_button(mouse_pos)
-                self._check_difficulty_buttons(mouse_pos)
+                self._check_play_button(event.pos)
+                self._check_difficulty_buttons(event.pos)
 
-            elif self.stats.game_active:
+            elif self.state.state == PLAYING:
                 if event.type == self.alien_shoot:
                     self._fire_alien_bullet()
 
+    def _get_events(self):
+        """Return this frame's events, recording them if asked to."""
+        if self.replaying:
+            # Timer events are replayed from the log like any other input,
+            # so drop the ones the clock posted.
+            pygame.event.clear()
+            events, self.replay_events = self.replay_events, []
+            return events
+
+        # A game with its own event queue only sees its own timer events.
+        queue = self.clock.event_queue
+        if queue is not None:
+            events = list(queue)
+            queue.clear()
+            return events
+
+        events = pygame.event.get()
+        if self.renderer.scaled:
+            events = [self._to_canvas_event(event) for event in events]
+        if self.recorder is not None:
+            self.recorder.add_events(events)
+        return events
+
+    def _to_canvas_event(self, event):
+        """Return event with any mouse position in canvas coordinates."""
+        if event.type != pygame.MOUSEBUTTONDOWN:
+            return event
+        return pygame.event.Event(event.type, pos=self.renderer.to_canvas(
+            event.pos), button=event.button)
+
     def _check_play_button(self, mouse_pos):
         """Start a new game when the player clicks Play."""
         button_clicked = self.play_button.rect.collidepoint(mouse_pos)
@@ -145,6 +546,11 @@ class AlienInvasion:
         Set difficulty based on user selection and highlight 
         the selected difficulty button.
         """
+        # The buttons are hidden during a game, and the game's score is
+        # recorded against the difficulty it started on.
+        if self.stats.game_active:
+            return
+
         rookie_button_clicked = self.rookie_button.rect.collidepoint(
             mouse_pos)
         hero_button_clicked = self.hero_button.rect.collidepoint(
@@ -171,6 +577,11 @@ class AlienInvasion:
             self.hero_button._reset_button_color()
             self.veteran_button._change_button_color()
 
+        # Show the high score for the newly selected difficulty.
+        if rookie_button_clicked or hero_button_clicked or veteran_button_clicked:
+            self.stats.load_high_score()
+            self.sb.prep_high_score()
+
     def _check_keydown_events(self, event):
         """Respond to keypresses."""
         if event.key == pygame.K_RIGHT:
@@ -180,7 +591,12 @@ class AlienInvasion:
         elif event.key == pygame.K_q:
             self._exit_game()
         elif event.key == pygame.K_SPACE:
-            self._fire_bullet()
+            if self.state.state == PLAYING:
+                self._fire_bullet()
+        elif event.key == pygame.K_F3:
+            self.profiler.toggle_overlay()
+        elif event.key == pygame.K_F4:
+            self.profiler.dump_csv()
 
     def _check_keyup_events(self, event):
         """Respond to key releases"""
@@ -190,19 +606,36 @@ class AlienInvasion:
             self.ship.moving_left = False
 
     def _fire_alien_bullet(self):
-        """Create a new bullet and add it  to the bullet group."""
-        for alien in self.aliens.sprites():
-            if len(self.alien_bullets) < self.settings.alien_bullets_allowed:
-                new_bullet = AlienBullet(alien.rect.centerx, alien.rect.centery)
-                self.alien_bullets.add(new_bullet)
+        """
+        Fire alien bullets up to the limit. A fleet fires from the lowest
+        alien of randomly picked columns.
+        """
+        room = self.settings.alien_bullets_allowed - len(self.alien_bullets)
+        if room <= 0:
+            return
+        if self.formation:
+            if self.settings.fleet_backend == 'array':
+                self.aliens.sync_rects()
+            front_line = self.formation.get_front_line()
+            shooters = self.random.sample(front_line,
+                                          min(room, len(front_line)))
+        else:
+            shooters = self.aliens.sprites()[:room]
+
+        for alien in shooters:
+            new_bullet = self.alien_bullet_pool.acquire(
+                alien.rect.centerx, alien.rect.centery)
+            self.alien_bullets.add(new_bullet)
+            # Boss Ship Lazer sound
+            self.sounds.play('boss')
 
-    def _update_alien_bullets(self):
+    def _update_alien_bullets(self, dt):
         """Update the position of bullets  and remove old bullets."""
         # Update bullet positions.
-        self.alien_bullets.update()
+        self.alien_bullets.update(dt)
 
         # Get rid of bullets that have disappeared.
-        for bullet in self.alien_bullets.copy():
+        for bullet in self.alien_bullets.sprites():
             if bullet.rect.bottom >= self.settings.screen_bottom:
                 self.alien_bullets.remove(bullet)
 
@@ -211,16 +644,18 @@ class AlienInvasion:
     def _fire_bullet(self):
         """Create a new bullet and add it  to the bullet group."""
         if len(self.bullets) < self.settings.bullets_allowed:
-            new_bullet = Bullet(self)
+            new_bullet = self.bullet_pool.acquire()
             self.bullets.add(new_bullet)
+            # Ship Lazer sound
+            self.sounds.play('lazer')
 
-    def _update_bullets(self):
+    def _update_bullets(self, dt):
         """Update the position of bullets  and remove old bullets."""
         # Update bullet positions.
-        self.bullets.update()
+        self.bullets.update(dt)
 
         # Get rid of bullets that have disappeared.
-        for bullet in self.bullets.copy():
+        for bullet in self.bullets.sprites():
             if bullet.rect.bottom <= 0:
                 self.bullets.remove(bullet)
 
@@ -228,83 +663,77 @@ class AlienInvasion:
 
     def _check_bullet_ship_collisions(self):
         """Respond to bullet_ship collisions."""
-        # Sound for when an alien ship is hit by a lazer
-        self.ship_hit = pygame.mixer.Sound('Sounds/alien_explode.wav')
-        self.ship_crash = pygame.mixer.Sound('Sounds/ship_crash.wav')
+        if not self.alien_bullets:
+            return
+
+        # Find the alien bullets that hit the ship, using the grid to skip
+        # bullets that are nowhere near it.
+        self.alien_bullet_grid.rebuild(self.alien_bullets.sprites())
+        collisions = self.alien_bullet_grid.collide(
+            self.ship, True, pygame.sprite.collide_mask)
 
         # If more than one ship left and ship health > 1 lower ship health by 
         # one. Else, lower ships_left by one and prep a new ship.
         if self.stats.ships_left >= 1:
             if self.settings.ship_health > 1:
 
-                collisions = pygame.sprite.spritecollide(
-                    self.ship, self.alien_bullets, True,
-                    pygame.sprite.collide_mask)
                 if collisions:
-                    self.ship_hit.play()
+                    self.sounds.play('alien_explode')
                     self.settings.ship_health -= 1
-                    exp = Explosion(self.ship.rect.centerx, self.ship.rect.centery, 1)
-                    self.explosions.add(exp)
+                    self.explosions.spawn(self.ship.rect.centerx, self.ship.rect.centery, 1)
             else:
                 # Decrement ships left, update scoreboard.
-                collisions = pygame.sprite.spritecollide(
-                    self.ship, self.alien_bullets, True,
-                    pygame.sprite.collide_mask)
                 if collisions:
-                    exp = Explosion(self.ship.rect.centerx, self.ship.rect.centery, 3)
-                    self.explosions.add(exp)
-                    self.ship_hit.play()
+                    self.explosions.spawn(self.ship.rect.centerx, self.ship.rect.centery, 3)
+                    self.sounds.play('alien_explode')
                     self.stats.ships_left -= 1
-                    self.ship_crash.play()
+                    self.sounds.play('ship_crash')
                     self.sb.prep_ships()
                     self.settings.ship_health = 5
         else:
             if self.settings.ship_health > 1:
 
-                collisions = pygame.sprite.spritecollide(
-                    self.ship, self.alien_bullets, True,
-                    pygame.sprite.collide_mask)
                 if collisions:
-                    self.ship_hit.play()
+                    self.sounds.play('alien_explode')
                     self.settings.ship_health -= 1
-                    exp = Explosion(self.ship.rect.centerx, self.ship.rect.centery, 1)
-                    self.explosions.add(exp)
+                    self.explosions.spawn(self.ship.rect.centerx, self.ship.rect.centery, 1)
             else:
-                # for bullet in self.alien_bullets:
-                collisions = pygame.sprite.spritecollide(
-                    self.ship, self.alien_bullets, True,
-                    pygame.sprite.collide_mask)
                 if collisions:
-                    self.ship_crash.play()
-                    exp = Explosion(self.ship.rect.centerx, self.ship.rect.centery, 3)
-                    self.explosions.add(exp)
+                    self.sounds.play('ship_crash')
+                    self.explosions.spawn(self.ship.rect.centerx, self.ship.rect.centery, 3)
                     self.stats.boss_beaten = False
                     self.settings.alien_health = 1
-                    pygame.time.set_timer(self.alien_shoot, 0)
-                    pygame.mixer.music.stop()
-                    self.game_over = pygame.mixer.Sound('Sounds/game_over.wav')
-                    self.game_over.play()
+                    self.clock.set_timer(self.alien_shoot, 0)
+                    self.sounds.stop_music()
+                    self.sounds.play('game_over')
 
-                    # Check/update high score, and set game_active to false
-                    self.stats._check_high_score()
+                    # Record the score, and set game_active to false
+                    self.stats.record_score()
                     self.stats.game_active = False
+                    self.state.enter(GAME_OVER)
                     pygame.mouse.set_visible(True)
 
     def _check_bullet_alien_collisions(self):
         """Respond to bullet_alien collisions."""
-        # Sound for when an alien ship is hit by a lazer
-        self.alien_hit = pygame.mixer.Sound('Sounds/alien_explode.wav')
+        # Bucket the aliens into the grid so each bullet is only tested
+        # against the aliens near it.
+        if self.bullets:
+            self.alien_grid.rebuild(self.aliens.sprites())
 
         # If the alien's health is greater than one, add score and lower alien 
         # health by 1 but do not kill the sprite
         if self.settings.alien_health > 1:
-            collisions = pygame.sprite.groupcollide(
-                self.bullets, self.aliens, True, False,
-                pygame.sprite.collide_mask)
+            collisions = {}
+            for bullet in self.bullets:
+                aliens = self.alien_grid.collide(
+                    bullet, False, pygame.sprite.collide_mask)
+                if aliens:
+                    bullet.kill()
+                    collisions[bullet] = aliens
             if collisions:
                 for aliens in collisions.values():
                     self.stats.score += self.settings.alien_points * len(aliens)
-                self.alien_hit.play()
+                self.sounds.play('alien_explode')
                 self.sb.prep_score()
                 self.sb.check_high_score()
                 self.settings.alien_health -= 1
@@ -313,18 +742,16 @@ class AlienInvasion:
             # If the alien is a regular alien, play the smaller explosion
             if not self.stats.boss_beaten:
                 for bullet in self.bullets:
-                    if pygame.sprite.spritecollide(bullet, self.aliens, True):
+                    if self.alien_grid.collide(bullet, True):
                         bullet.kill()
-                        exp = Explosion(bullet.rect.centerx, bullet.rect.centery, 2)
-                        self.explosions.add(exp)
+                        self.explosions.spawn(bullet.rect.centerx, bullet.rect.centery, 2)
                         self._score_alien()
                         # If the alien is the boss, play the larger explosion
             elif self.stats.boss_beaten:
                 for bullet in self.bullets:
-                    if pygame.sprite.spritecollide(bullet, self.aliens, True):
+                    if self.alien_grid.collide(bullet, True):
                         bullet.kill()
-                        exp = Explosion(bullet.rect.centerx, bullet.rect.centery, 3)
-                        self.explosions.add(exp)
+                        self.explosions.spawn(bullet.rect.centerx, bullet.rect.centery, 3)
                         self._score_alien()
 
         # When aliens sprite group is empty the game spawns the boss if 
@@ -342,7 +769,7 @@ class AlienInvasion:
         and reset the alien's health
         """
         self.stats.score += self.settings.alien_points * 1
-        self.alien_hit.play()
+        self.sounds.play('alien_explode')
         self.sb.prep_score()
         self.sb.check_high_score()
         self.settings.alien_health = 0
@@ -352,12 +779,17 @@ class AlienInvasion:
         Method that empties bullets, creates a new fleet, increases speed, 
         resets the boss_beaten flag, and increments the level indicators
         """
-        pygame.time.set_timer(self.alien_shoot, 0)
+        self.clock.set_timer(self.alien_shoot, 0)
         # Empty sprite groups and wait one second before starting the next level
         self.aliens.empty()
         self.bullets.empty()
         self.alien_bullets.empty()
-        sleep(1)
+        self.state.enter(LEVEL_TRANSITION,
+                         self.settings.level_transition_time,
+                         self._finish_level_transition)
+
+    def _finish_level_transition(self):
+        """Create the next level's fleet and carry on playing."""
         self._create_fleet()
         self.settings.increase_speed()
 
@@ -365,29 +797,33 @@ class AlienInvasion:
         self.stats.level += 1
         self.sb.prep_level()
         self.stats.boss_beaten = False
+        self._resume_play()
 
     def _start_boss_fight(self):
         """Method that creates the boss preps/starts the boss fight"""
         # Empty sprite groups, prep the boss health, and create the boss.
         self.stats.boss_beaten = True
         if self.stats.game_active and self.stats.boss_beaten:
-            pygame.time.set_timer(self.alien_shoot, 2000)
+            self.clock.set_timer(self.alien_shoot, 2000)
             self.aliens.empty()
             self.bullets.empty()
             self._create_boss_alien()
             self.settings.alien_health = 15
 
 
-    def _update_aliens(self):
+    def _update_aliens(self, dt):
         """
         Check if the fleet is at an edge, 
         then update the position of all aliens in the fleet.
         """
         self._check_fleet_edges()
-        self.aliens.update()
+        self.aliens.update(dt)
 
         # Look for alien-ship collisions.
-        if pygame.sprite.spritecollideany(self.ship, self.aliens):
+        if self.settings.fleet_backend == 'array':
+            if self.aliens.collides_with(self.ship.rect):
+                self._ship_hit()
+        elif pygame.sprite.spritecollideany(self.ship, self.aliens):
             self._ship_hit()
 
         # Look for aliens hitting the bottom of the screen.
@@ -397,8 +833,7 @@ class AlienInvasion:
         """Respond to the ship being hit by an alien."""
         if self.stats.ships_left > 0:
             # Play Ship Collision sound
-            self.ship_crash = pygame.mixer.Sound('Sounds/ship_crash.wav')
-            self.ship_crash.play()
+            self.sounds.play('ship_crash')
             # Decrement ships left, update scoreboard.
             self.stats.ships_left -= 1
             self.sb.prep_ships()
@@ -411,23 +846,33 @@ class AlienInvasion:
             self._create_fleet()
             self.ship.center_ship()
 
-            # Pause.
-            sleep(0.5)
+            # Hold still before the new fleet attacks.
+            self.state.enter(RESPAWN, self.settings.respawn_time,
+                             self._resume_play)
         else:
             # Stop the game music and play 'ship crash' and 'game over' sound
             self.stats.boss_beaten == False
-            pygame.mixer.music.stop()
-            self.ship_crash.play()
-            self.game_over = pygame.mixer.Sound('Sounds/game_over.wav')
-            self.game_over.play()
+            self.sounds.stop_music()
+            self.sounds.play('ship_crash')
+            self.sounds.play('game_over')
 
-            # Check/update high score, and set game_active to false
-            self.stats._check_high_score()
+            # Record the score, and set game_active to false
+            self.stats.record_score()
             self.stats.game_active = False
+            self.state.enter(GAME_OVER)
             pygame.mouse.set_visible(True)
 
     def _check_aliens_bottom(self):
         """Check if any aliens have reached the bottom of the screen."""
+        if self.settings.fleet_backend == 'array':
+            if self.aliens.check_bottom():
+                self._ship_hit()
+            return
+        if self.formation:
+            if self.formation.check_bottom(self.screen.get_rect()):
+                self._ship_hit()
+            return
+
         screen_rect = self.screen.get_rect()
         for alien in self.aliens.sprites():
             if alien.rect.bottom >= screen_rect.bottom:
@@ -449,7 +894,8 @@ class AlienInvasion:
                              (2 * alien_height) - ship_height)
         number_rows = available_space_y // (4 * alien_height)
 
-        # Create the full fleet of aliens.
+        # Create the full fleet of aliens, indexed by column and row.
+        self.formation = Formation(number_aliens_x, number_rows)
         for row_number in range(number_rows):
             for alien_number in range(number_aliens_x):
                 self._create_alien(alien_number, row_number)
@@ -462,16 +908,27 @@ class AlienInvasion:
         alien.y = alien_height + 2 * alien_height * row_number
         alien.rect.x = alien.x
         alien.rect.y = alien.y
+        self.formation.add(alien, alien_number, row_number)
         self.aliens.add(alien)
 
     def _create_boss_alien(self):
         """Create a boss alien"""
+        self.formation = None
         self.boss = Alien(self)
         self.boss._change_alien_image()
         self.aliens.add(self.boss)
 
     def _check_fleet_edges(self):
         """Respond appropriately if any aliens have reached an edge."""
+        if self.settings.fleet_backend == 'array':
+            if self.aliens.check_edges():
+                self._change_fleet_direction()
+            return
+        if self.formation:
+            if self.formation.check_edges(self.screen.get_rect()):
+                self._change_fleet_direction()
+            return
+
         for alien in self.aliens.sprites():
             if alien.check_edges():
                 self._change_fleet_direction()
@@ -479,40 +936,81 @@ class AlienInvasion:
 
     def _change_fleet_direction(self):
         """Drop the entire fleet and change the fleet's direction."""
-        for alien in self.aliens.sprites():
-            alien.rect.y += self.settings.fleet_drop_speed
+        if self.settings.fleet_backend == 'array':
+            self.aliens.drop(self.settings.fleet_drop_speed)
+        else:
+            for alien in self.aliens.sprites():
+                alien.rect.y += self.settings.fleet_drop_speed
         self.settings.fleet_direction *= -1
 
-    def _update_screen(self):
-        """Update images on the screen and flip to the new screen."""
+    def _update_screen(self, alpha=1.0):
+        """
+        Update images on the screen and flip to the new screen. Moving
+        sprites are drawn alpha of the way between their last two
+        simulated positions.
+        """
+        self._draw_frame(alpha)
+
+        # Make the most recently drawn screen visible.
+        self.renderer.present()
+
+    def _draw_frame(self, alpha=1.0):
+        """Draw the current frame to the screen without showing it."""
         # Redraw the screenduring each pass through the loop.
-        self.screen.blit(self.settings.bg, self.settings.bg_rect)
-        self.ship.blitme()
-        self.alien_bullets.draw(self.screen)
-        self.bullets.draw(self.screen)
-        self.aliens.draw(self.screen)
-        self.explosions.draw(self.screen)
+        renderer = self.renderer
+        renderer.begin()
+        renderer.draw([(self.ship.image, interpolate(self.ship, alpha))])
+        renderer.draw(interpolated_blits(self.alien_bullets, alpha))
+        renderer.draw(interpolated_blits(self.bullets, alpha))
+        if self.settings.fleet_backend == 'array':
+            renderer.draw(self.aliens.get_blits(alpha))
+        else:
+            renderer.draw(interpolated_blits(self.aliens, alpha))
+        renderer.draw(self.explosions.get_blits())
 
         # Draw score information
-        self.sb.show_score()
+        renderer.draw(self.sb.get_blits())
 
         # Draw the game buttons if the game is inactive
         if not self.stats.game_active:
-            self.play_button.draw_button()
-            self.rookie_button.draw_button()
-            self.hero_button.draw_button()
-            self.veteran_button.draw_button()
+            for button in (self.play_button, self.rookie_button,
+                           self.hero_button, self.veteran_button):
+                button.draw_button()
+                renderer.add_dirty(button.rect)
 
-            # Make the most recently drawn screen visible.
-        pygame.display.flip()
+        # Draw the profiler overlay on top of everything else.
+        if self.profiler.show_overlay:
+            renderer.add_dirty(self.profiler.draw_overlay())
 
     def _exit_game(self):
-        """Save the high score and exit the game using sys.exit()."""
-        self.stats._check_high_score()
+        """Save the score and exit the game using sys.exit()."""
+        self.stats.record_score()
+        # Wait for the leaderboard to reach the disk before exiting.
+        self.stats.leaderboard.flush()
+        if self.recorder is not None:
+            self.recorder.save()
         sys.exit()
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play Alien Invasion.")
+    parser.add_argument('--startup-profile', '--startup-report',
+                        action='store_true',
+                        help='print how long each stage of startup took')
+    parser.add_argument('--record', metavar='PATH',
+                        help='record every frame of input to a replay file')
+    parser.add_argument('--seed', type=int, help='seed for the game RNG')
+    parser.add_argument('--windowed', action='store_true',
+                        help='play in a window instead of full screen')
+    parser.add_argument('--resolution', type=int, nargs=2,
+                        metavar=('WIDTH', 'HEIGHT'),
+                        help='size the game is drawn at before scaling')
+    args = parser.parse_args()
+
     # Make a game instance and run the game. 
-    ai = AlienInvasion()
+    ai = AlienInvasion(seed=args.seed, windowed=args.windowed,
+                       resolution=args.resolution and tuple(args.resolution))
+    ai.settings.startup_report = args.startup_profile
+    if args.record:
+        ai.recorder = Recorder(ai, args.record)
     ai.run_game()
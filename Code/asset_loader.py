@@ -0,0 +1,77 @@
+import sys
+import threading
+import time
+
+
+class AssetLoader:
+    """
+    A class that runs a list of loading jobs on a worker thread, so the main
+    loop can keep drawing a progress screen, or the game itself, meanwhile.
+    """
+
+    def __init__(self, keep_going=False):
+        """
+        Initialize an empty job list. A loader that keeps going reports a
+        job that fails and runs the rest, instead of stopping at it.
+        """
+        # (name, function, args) for each job, in the order they are run.
+        self.jobs = []
+
+        # Seconds each finished job took, keyed by job name.
+        self.timings = {}
+
+        self.completed = 0
+        self.error = None
+        self.thread = None
+        self.keep_going = keep_going
+
+        # The error each failed job raised, keyed by job name, when the
+        # loader keeps going.
+        self.failures = {}
+
+    def add(self, name, function, *args):
+        """Queue function(*args) to be run as the job name."""
+        self.jobs.append((name, function, args))
+
+    def start(self):
+        """Run the jobs on a background thread."""
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        """Run every job in order on the calling thread."""
+        for name, function, args in self.jobs[self.completed:]:
+            start = time.perf_counter()
+            try:
+                function(*args)
+            except Exception as error:
+                if not self.keep_going:
+                    # Keep the error for the main thread to raise in wait().
+                    self.error = error
+                    return
+                print(f"Couldn't load {name}: {error}", file=sys.stderr)
+                self.failures[name] = error
+            else:
+                self.timings[name] = time.perf_counter() - start
+            self.completed += 1
+
+    def get_progress(self):
+        """Return the fraction of jobs finished, from 0 to 1."""
+        if not self.jobs:
+            return 1.0
+        return self.completed / len(self.jobs)
+
+    def is_done(self):
+        """Return True once every job has finished or one has failed."""
+        return self.completed == len(self.jobs) or self.error is not None
+
+    def wait(self):
+        """Block until the jobs are done and raise any error they hit."""
+        if self.thread is not None:
+            self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def get_total_time(self):
+        """Return the seconds spent running jobs so far."""
+        return sum(self.timings.values())
@@ -0,0 +1,166 @@
+import json
+import os
+
+import pygame
+
+# Asset paths are resolved against the project root so the game does not
+# depend on the current working directory.
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Index of the packed sprite atlas written by build_atlas.py.
+ATLAS_INDEX = 'Images/atlas.json'
+
+BACKGROUND = 'Images/background.jpg'
+
+# Sprites drawn at a fraction of the screen's width and height, so they
+# scale up and down between screen resolutions.
+SPRITE_SCALES = {
+    'Images/ship-medium.png': (.03, .04),
+    'Images/alien-medium.png': (.035, .048),
+    'Images/bullet.png': (.02, .04),
+}
+
+
+def get_sprite_size(path, screen_rect):
+    """Return the size the sprite image at path is drawn at on screen_rect."""
+    width, height = SPRITE_SCALES[path]
+    return screen_rect.width * width, screen_rect.height * height
+
+
+class AssetManager:
+    """A class to load, scale and cache the game's images once per session."""
+
+    def __init__(self):
+        """Initialize the image cache."""
+        # Decoded, scaled and converted surfaces keyed by (path, size).
+        self.images = {}
+
+        # Decoded, unscaled surfaces keyed by path so that every file is
+        # only read from disk once, whatever sizes it is scaled to.
+        self.sources = {}
+
+        # Collision masks keyed by the surface they were built from.
+        self.masks = {}
+
+        # Fonts keyed by (name, size).
+        self.fonts = {}
+
+        # The packed sprite atlas, if loaded, and each sprite's area in it
+        # keyed by the sprite's own path.
+        self.atlas = None
+        self.atlas_frames = {}
+
+    def get_image(self, path, size=None):
+        """
+        Return the image at path scaled to size. The surface is loaded and
+        scaled on first use and shared by every later caller.
+        """
+        if size is not None:
+            size = (int(size[0]), int(size[1]))
+        key = (path, size)
+        image = self.images.get(key)
+        if image is None:
+            image = self._load_source(path)
+            if size is not None:
+                image = pygame.transform.scale(image, size)
+            self.images[key] = image
+        return image
+
+    def get_mask(self, image):
+        """
+        Return the collision mask for image. Every sprite drawn with the
+        same cached surface shares one mask.
+        """
+        mask = self.masks.get(image)
+        if mask is None:
+            mask = pygame.mask.from_surface(image)
+            self.masks[image] = mask
+        return mask
+
+    def get_font(self, size, name=None):
+        """Return the system font name at size, loading it on first use."""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(name, size)
+            self.fonts[key] = font
+        return font
+
+    def get_images(self, paths, size=None):
+        """Return a list of images, one per path, all scaled to size."""
+        return [self.get_image(path, size) for path in paths]
+
+    def load_atlas(self, index_path=ATLAS_INDEX):
+        """
+        Load the packed sprite atlas so sprites are cut from it instead of
+        read from their own files. Return False if it hasn't been built.
+        """
+        try:
+            with open(os.path.join(BASE_DIR, index_path),
+                      encoding='utf-8') as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return False
+
+        atlas = pygame.image.load(os.path.join(BASE_DIR, index['image']))
+        if pygame.display.get_surface() is not None:
+            atlas = atlas.convert_alpha()
+        self.atlas = atlas
+        self.atlas_frames = {path: pygame.Rect(rect)
+                             for path, rect in index['frames'].items()}
+        return True
+
+    def _load_source(self, path):
+        """Load an image from disk and convert it to the display format."""
+        source = self.sources.get(path)
+        if source is None:
+            rect = self.atlas_frames.get(path)
+            if rect is not None:
+                # Share the atlas pixels rather than copying them.
+                source = self.atlas.subsurface(rect)
+            else:
+                source = pygame.image.load(os.path.join(BASE_DIR, path))
+                if pygame.display.get_surface() is not None:
+                    source = source.convert_alpha()
+            self.sources[path] = source
+        return source
+
+    def get_background(self, size):
+        """
+        Return the background scaled to size. It has no transparency, so it
+        is converted without an alpha channel to keep full screen blits fast.
+        """
+        size = (int(size[0]), int(size[1]))
+        key = (BACKGROUND, size)
+        image = self.images.get(key)
+        if image is None:
+            image = pygame.image.load(os.path.join(BASE_DIR, BACKGROUND))
+            image = pygame.transform.scale(image, size)
+            if pygame.display.get_surface() is not None:
+                image = image.convert()
+            self.images[key] = image
+        return image
+
+    def get_startup_images(self, screen_rect):
+        """
+        Return (path, size) for every sprite image needed to show the menu
+        and start a game at the resolution of screen_rect.
+        """
+        images = [(path, get_sprite_size(path, screen_rect))
+                  for path in SPRITE_SCALES]
+        images.append(('Images/alien_bullet.png', None))
+        # Aliens and the ship can explode as soon as play starts.
+        for size in (EXPLOSION_SIZES[1], EXPLOSION_SIZES[2]):
+            images += [(path, size) for path in EXPLOSION_FRAMES]
+        return images
+
+    def get_later_images(self):
+        """Return (path, size) for sprite images only needed mid-game."""
+        images = [('Images/boss2.png', None)]
+        images += [(path, EXPLOSION_SIZES[3]) for path in EXPLOSION_FRAMES]
+        return images
+
+
+# Explosion animation frames and the size each explosion type is drawn at.
+EXPLOSION_FRAMES = [f'Images/exp{num}.png' for num in range(1, 6)]
+EXPLOSION_SIZES = {1: (20, 20), 2: (40, 40), 3: (160, 160)}
@@ -0,0 +1,215 @@
+"""
+Play many headless games with bot players to help balance the difficulty.
+
+Games run in a process pool, one reused game per worker process, and every
+combination of the swept settings is played the requested number of times:
+
+    python Code/batch_sim.py --games 500 --policy tracker \\
+        --set speedup_scale=1.05,1.1,1.2 --set score_scale=1.5,2
+
+The report gives the survival time, level reached and score distributions
+of each combination of difficulty and settings.
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import time
+from statistics import mean
+
+from game_state import GAME_OVER
+
+# The game reused by every job run in a worker process.
+worker_game = None
+
+# Settings fixed when the game's window is made, which restart() can't
+# change, so they can't be swept.
+FIXED_SETTINGS = ('headless', 'windowed', 'screen_width', 'screen_height',
+                  'screen_bottom')
+
+
+def random_policy(ai_game, rng):
+    """Wander left and right at random, firing now and then."""
+    ship = ai_game.ship
+    if rng.random() < 0.1:
+        move = rng.choice((-1, 0, 1))
+        ship.moving_left = move < 0
+        ship.moving_right = move > 0
+    if rng.random() < 0.3:
+        ai_game._fire_bullet()
+
+
+def tracker_policy(ai_game, rng):
+    """
+    Move under the nearest alien and fire. The bot sometimes misses a
+    decision, so games with different seeds play out differently.
+    """
+    if rng.random() < 0.2:
+        return
+    ship = ai_game.ship
+    aliens = ai_game.aliens.sprites()
+    if aliens:
+        target = min(aliens, key=lambda alien: abs(
+            alien.rect.centerx - ship.rect.centerx))
+        offset = target.rect.centerx - ship.rect.centerx
+        ship.moving_right = offset > ship.rect.width // 4
+        ship.moving_left = offset < -ship.rect.width // 4
+    ai_game._fire_bullet()
+
+
+POLICIES = {
+    'random': random_policy,
+    'tracker': tracker_policy,
+}
+
+
+def _init_worker():
+    """Create the game this worker process plays every job with."""
+    global worker_game
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    from alien_invasion import AlienInvasion
+    worker_game = AlienInvasion(headless=True, render=False)
+
+
+def play_game(job):
+    """
+    Play one game for a job of (config, policy, seed, max_seconds, ticks)
+    and return the config with how the game went.
+    """
+    config, policy, seed, max_seconds, ticks = job
+    ai_game = worker_game
+    ai_game.restart(config)
+    # Seed the game as well as the bot, so a job plays out the same
+    # whichever worker runs it and whatever it ran before.
+    ai_game.seed = seed
+    ai_game.random.seed(seed)
+    ai_game._start_game()
+
+    rng = random.Random(seed)
+    decide = POLICIES[policy]
+    dt = ai_game.clock.dt
+    max_ticks = round(max_seconds / dt)
+    elapsed = 0
+    while elapsed < max_ticks and ai_game.state.state != GAME_OVER:
+        decide(ai_game, rng)
+        ai_game.step(ticks)
+        elapsed += ticks
+
+    return config, {
+        'survival_s': elapsed * dt,
+        'level': ai_game.stats.level,
+        'score': ai_game.stats.score,
+        'game_over': ai_game.state.state == GAME_OVER,
+    }
+
+
+def get_configs(difficulties, sweeps):
+    """Return a settings dict for every combination of the swept values."""
+    names = ['difficulty_level'] + list(sweeps)
+    values = [difficulties] + list(sweeps.values())
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def summarize(values):
+    """Return the mean and percentiles of a list of numbers."""
+    ordered = sorted(values)
+
+    def at(percent):
+        return ordered[min(len(ordered) - 1,
+                           int(round(percent / 100 * (len(ordered) - 1))))]
+
+    return {'mean': mean(ordered), 'p10': at(10), 'p50': at(50),
+            'p90': at(90), 'max': ordered[-1]}
+
+
+def run_sweep(configs, games, policy='tracker', max_seconds=120, ticks=4,
+              workers=None, seed=0):
+    """Play games games of every config and return one result per config."""
+    jobs = [(config, policy, seed + index, max_seconds, ticks)
+            for config in configs for index in range(games)]
+    results = {json.dumps(config, sort_keys=True): [] for config in configs}
+
+    workers = workers or os.cpu_count()
+    chunksize = max(1, len(jobs) // (workers * 8))
+    with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+        for config, outcome in pool.imap_unordered(play_game, jobs,
+                                                   chunksize):
+            results[json.dumps(config, sort_keys=True)].append(outcome)
+        # Let the workers exit on their own. SDL turns the SIGTERM that
+        # Pool.terminate() sends into a quit event, so it can't stop them.
+        pool.close()
+        pool.join()
+
+    report = []
+    for key, outcomes in results.items():
+        report.append({
+            'settings': json.loads(key),
+            'games': len(outcomes),
+            'game_over_rate': mean(o['game_over'] for o in outcomes),
+            'survival_s': summarize([o['survival_s'] for o in outcomes]),
+            'level': summarize([o['level'] for o in outcomes]),
+            'score': summarize([o['score'] for o in outcomes]),
+        })
+    return report
+
+
+def parse_sweep(text):
+    """Turn 'name=1,2,3' into ('name', [1, 2, 3])."""
+    name, values = text.split('=', 1)
+    if name in FIXED_SETTINGS:
+        raise ValueError(f"{name} is fixed when the game is created and "
+                         "can't be swept")
+    return name, [json.loads(value) for value in values.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--games', type=int, default=100,
+                        help='games to play for each combination')
+    parser.add_argument('--policy', choices=sorted(POLICIES),
+                        default='tracker', help='how the bot plays')
+    parser.add_argument('--difficulty', default='rookie,hero,veteran',
+                        help='comma separated difficulty levels to play')
+    parser.add_argument('--set', action='append', default=[],
+                        metavar='NAME=V1,V2', help='setting values to sweep')
+    parser.add_argument('--max-seconds', type=float, default=120,
+                        help='simulated seconds before a game is cut off')
+    parser.add_argument('--ticks', type=int, default=4,
+                        help='simulation ticks between bot decisions')
+    parser.add_argument('--workers', type=int,
+                        help='worker processes, one per core by default')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed of the first game')
+    parser.add_argument('--output', default='batch_results.json',
+                        help='file to save the report to')
+    args = parser.parse_args()
+
+    try:
+        sweeps = dict(parse_sweep(text) for text in args.set)
+    except ValueError as error:
+        parser.error(f"--set: {error}")
+    configs = get_configs(args.difficulty.split(','), sweeps)
+
+    start = time.perf_counter()
+    report = run_sweep(configs, args.games, args.policy, args.max_seconds,
+                       args.ticks, args.workers, args.seed)
+    seconds = time.perf_counter() - start
+
+    for result in report:
+        print(f"{json.dumps(result['settings'])}: "
+              f"over {result['game_over_rate']:.0%}  "
+              f"survived {result['survival_s']['p50']:.0f}s  "
+              f"level {result['level']['p50']}  "
+              f"score {result['score']['p50']}")
+    print(f"{len(configs) * args.games} games in {seconds:.1f}s")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'policy': args.policy, 'max_seconds': args.max_seconds,
+                   'seconds': seconds, 'results': report}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+"""
+Scripted benchmark scenarios for Alien Invasion.
+
+Each scenario drives a headless AlienInvasion game and reports frames per
+second, frame time percentiles and the time spent in each subsystem of the
+main loop. Results are saved as JSON so runs can be compared between commits:
+
+    python Code/benchmark.py --output before.json
+    python Code/benchmark.py --output after.json --compare before.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import time
+from collections import deque
+from statistics import mean
+
+from alien import Alien
+from alien_invasion import AlienInvasion
+from fleet import ArrayFleet
+
+RESOLUTIONS = [(1280, 720), (1920, 1080), (2560, 1440), (3840, 2160)]
+
+
+def percentile(values, percent):
+    """Return the value at percent of the sorted values."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+# Fleet backend and render mode used by every scenario, set from the
+# command line.
+fleet_backend = 'sprite'
+render_mode = 'full'
+
+
+def make_game(resolution=None, seed=0):
+    """Create a headless game that is started."""
+    ai_game = AlienInvasion(headless=True, seed=seed, resolution=resolution)
+    if fleet_backend == 'array':
+        ai_game.settings.fleet_backend = 'array'
+        ai_game.aliens = ArrayFleet(ai_game)
+    ai_game.settings.render_mode = render_mode
+    ai_game._start_game()
+    return ai_game
+
+
+def run_frames(ai_game, frames, each_frame=None):
+    """Step ai_game for a number of frames and return the results."""
+    profiler = ai_game.profiler
+    profiler.frames = deque(maxlen=frames)
+    profiler.enabled = True
+    frame_times = []
+    for frame in range(frames):
+        start = time.perf_counter()
+        if each_frame:
+            each_frame(ai_game, frame)
+        # Top up the ships so the game never ends mid scenario.
+        ai_game.stats.ships_left = ai_game.settings.ship_limit
+        ai_game.step()
+        frame_times.append(time.perf_counter() - start)
+
+    total = sum(frame_times)
+    return {
+        'frames': frames,
+        'fps': frames / total,
+        'frame_ms': {
+            'mean': mean(frame_times) * 1000,
+            'p50': percentile(frame_times, 50) * 1000,
+            'p95': percentile(frame_times, 95) * 1000,
+            'p99': percentile(frame_times, 99) * 1000,
+        },
+        'subsystem_ms': {
+            phase: mean(timings[phase] for _, timings, _ in profiler.frames)
+            for phase in profiler.phases},
+        'collisions': {
+            counter: mean(counts[counter] for _, _, counts in profiler.frames)
+            for counter in ('collision_pairs', 'collision_checks',
+                            'collision_hits', 'dirty_percent')},
+        'pools': {
+            'bullets': ai_game.bullet_pool.get_stats(),
+            'alien_bullets': ai_game.alien_bullet_pool.get_stats(),
+        },
+        'explosions_evicted': ai_game.explosions.evicted,
+    }
+
+
+def scenario_fleet(frames, resolution):
+    """Create full fleets and march them across the screen."""
+    ai_game = make_game(resolution)
+
+    start = time.perf_counter()
+    for _ in range(10):
+        ai_game.aliens.empty()
+        ai_game._create_fleet()
+    create_ms = (time.perf_counter() - start) * 100
+
+    result = run_frames(ai_game, frames)
+    result['aliens'] = len(ai_game.aliens)
+    result['create_fleet_ms'] = create_ms
+    return result
+
+
+def scenario_swarm(frames, columns=80, rows=25):
+    """March a dense fleet of thousands of overlapping aliens."""
+    ai_game = make_game()
+    ai_game.aliens.empty()
+    for row in range(rows):
+        for column in range(columns):
+            alien = Alien(ai_game)
+            alien.x = alien.rect.width + column * alien.rect.width / 4
+            alien.rect.x = alien.x
+            alien.rect.y = alien.rect.height + row * alien.rect.height / 4
+            ai_game.aliens.add(alien)
+
+    result = run_frames(ai_game, frames)
+    result['aliens'] = len(ai_game.aliens)
+    return result
+
+
+def scenario_boss_fight(frames):
+    """Fight the boss with the player firing as fast as allowed."""
+    ai_game = make_game()
+    ai_game.aliens.empty()
+    ai_game._start_boss_fight()
+
+    def fire(ai_game, frame):
+        ai_game._fire_bullet()
+        ai_game.ship.moving_right = (frame // 120) % 2 == 0
+        ai_game.ship.moving_left = not ai_game.ship.moving_right
+
+    return run_frames(ai_game, frames, fire)
+
+
+def scenario_bullet_storm(frames, bullets=200):
+    """Keep the player and alien bullet groups saturated every frame."""
+    ai_game = make_game()
+    ai_game.settings.bullets_allowed = bullets
+    ai_game.settings.alien_bullets_allowed = bullets
+
+    def fire(ai_game, frame):
+        ai_game._fire_bullet()
+        ai_game._fire_alien_bullet()
+        ai_game.ship.moving_right = (frame // 60) % 2 == 0
+        ai_game.ship.moving_left = not ai_game.ship.moving_right
+
+    return run_frames(ai_game, frames, fire)
+
+
+def scenario_explosions(frames, per_frame=10):
+    """Spawn a steady stream of explosions of every size."""
+    ai_game = make_game()
+    screen_rect = ai_game.screen.get_rect()
+
+    def explode(ai_game, frame):
+        for _ in range(per_frame):
+            x = ai_game.random.randrange(screen_rect.width)
+            y = ai_game.random.randrange(screen_rect.height)
+            size = ai_game.random.choice((1, 2, 3))
+            ai_game.explosions.spawn(x, y, size)
+
+    return run_frames(ai_game, frames, explode)
+
+
+def run_benchmarks(frames):
+    """Run every scenario and return the results keyed by scenario name."""
+    results = {}
+    for resolution in RESOLUTIONS:
+        name = 'fleet_{}x{}'.format(*resolution)
+        results[name] = scenario_fleet(frames, resolution)
+    results['swarm'] = scenario_swarm(frames)
+    results['boss_fight'] = scenario_boss_fight(frames)
+    results['bullet_storm'] = scenario_bullet_storm(frames)
+    results['explosions'] = scenario_explosions(frames)
+    return results
+
+
+def get_commit():
+    """Return the current git commit, if there is one."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+            text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, baseline=None):
+    """Print a summary table, with the change from baseline if given."""
+    print(f"{'scenario':<18}{'fps':>10}{'p50 ms':>10}"
+          f"{'p95 ms':>10}{'p99 ms':>10}{'vs base':>10}")
+    for name, result in results.items():
+        frame_ms = result['frame_ms']
+        change = ''
+        if baseline and name in baseline['scenarios']:
+            base_fps = baseline['scenarios'][name]['fps']
+            change = f"{(result['fps'] / base_fps - 1) * 100:+.1f}%"
+        print(f"{name:<18}{result['fps']:>10.1f}{frame_ms['p50']:>10.3f}"
+              f"{frame_ms['p95']:>10.3f}{frame_ms['p99']:>10.3f}{change:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--frames', type=int, default=600,
+                        help='frames to run for each scenario')
+    parser.add_argument('--output', default='bench_results.json',
+                        help='file to save the results to')
+    parser.add_argument('--compare', help='results file to compare against')
+    parser.add_argument('--fleet-backend', choices=['sprite', 'array'],
+                        default='sprite', help='how the fleet is stored')
+    parser.add_argument('--render-mode', choices=['full', 'dirty'],
+                        default='full', help='how frames are drawn')
+    args = parser.parse_args()
+
+    global fleet_backend, render_mode
+    fleet_backend = args.fleet_backend
+    render_mode = args.render_mode
+
+    report = {
+        'commit': get_commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'frames': args.frames,
+        'fleet_backend': args.fleet_backend,
+        'render_mode': args.render_mode,
+        'scenarios': run_benchmarks(args.frames),
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_results(report['scenarios'], baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Pack the game's sprite images into one atlas image and a JSON index.
+
+The game loads the atlas once at startup and hands out subsurfaces of it
+instead of loading every sprite file on its own. Rebuild the atlas whenever
+a sprite image changes:
+
+    python Code/build_atlas.py
+
+Compare load time and blit throughput against per-file loading with:
+
+    python Code/build_atlas.py --benchmark
+"""
+import argparse
+import json
+import os
+import time
+
+import pygame
+
+from assets import ATLAS_INDEX, BASE_DIR, EXPLOSION_FRAMES, AssetManager
+
+# Every sprite the game draws. The background is a full screen JPEG with no
+# transparency, so it gains nothing from being packed.
+SPRITE_IMAGES = [
+    'Images/alien-medium.png',
+    'Images/alien_bullet.png',
+    'Images/boss.png',
+    'Images/boss2.png',
+    'Images/bullet.png',
+    'Images/ship-medium.png',
+] + EXPLOSION_FRAMES
+
+# Widest the atlas may be, and the gap left around each sprite so scaled
+# sprites never pick up their neighbours' edges.
+MAX_WIDTH = 1024
+PADDING = 1
+
+
+def pack(sizes, max_width=MAX_WIDTH, padding=PADDING):
+    """
+    Place rects of the given sizes on shelves, tallest first. Return each
+    rect's position, keyed like sizes, and the size of the whole atlas.
+    """
+    positions = {}
+    x = y = shelf_height = width = 0
+    for key, (w, h) in sorted(sizes.items(), key=lambda item: -item[1][1]):
+        if x + w + padding > max_width and x > 0:
+            # Start a new shelf under the current one.
+            y += shelf_height
+            x = shelf_height = 0
+        positions[key] = (x, y)
+        x += w + padding
+        shelf_height = max(shelf_height, h + padding)
+        width = max(width, x)
+    return positions, (width, y + shelf_height)
+
+
+def build(paths=SPRITE_IMAGES, index_path=ATLAS_INDEX):
+    """Pack the images at paths into an atlas and write it and its index."""
+    images = {path: pygame.image.load(os.path.join(BASE_DIR, path))
+              for path in paths}
+    positions, size = pack(
+        {path: image.get_size() for path, image in images.items()})
+
+    atlas = pygame.Surface(size, pygame.SRCALPHA)
+    frames = {}
+    for path, image in images.items():
+        atlas.blit(image, positions[path])
+        frames[path] = list(positions[path]) + list(image.get_size())
+
+    image_path = os.path.splitext(index_path)[0] + '.png'
+    pygame.image.save(atlas, os.path.join(BASE_DIR, image_path))
+    with open(os.path.join(BASE_DIR, index_path), 'w', encoding='utf-8') as f:
+        json.dump({'image': image_path, 'frames': frames}, f, indent=2)
+    return image_path, size
+
+
+def _time_loading(use_atlas, repeats):
+    """Return the mean seconds taken to load every sprite once."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        assets = AssetManager()
+        if use_atlas:
+            assets.load_atlas()
+        for path in SPRITE_IMAGES:
+            assets.get_image(path)
+    return (time.perf_counter() - start) / repeats
+
+
+def _time_blits(use_atlas, screen, count, repeats):
+    """Return the blits per second when drawing count of every sprite."""
+    assets = AssetManager()
+    if use_atlas:
+        assets.load_atlas()
+    images = [assets.get_image(path) for path in SPRITE_IMAGES]
+    blits = [(images[n % len(images)], ((n * 37) % 1200, (n * 53) % 680))
+             for n in range(count)]
+    start = time.perf_counter()
+    for _ in range(repeats):
+        screen.blits(blits, doreturn=False)
+    return count * repeats / (time.perf_counter() - start)
+
+
+def benchmark(repeats=20, count=2000):
+    """Compare per-file and atlas loading and blitting, and print results."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.display.init()
+    screen = pygame.display.set_mode((1280, 720))
+
+    results = {}
+    for name, use_atlas in (('files', False), ('atlas', True)):
+        results[name] = {
+            'load_ms': _time_loading(use_atlas, repeats) * 1000,
+            'blits_per_s': _time_blits(use_atlas, screen, count, repeats),
+        }
+        print(f"{name:>6}: load {results[name]['load_ms']:8.2f} ms  "
+              f"{results[name]['blits_per_s']:12,.0f} blits/s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--benchmark', action='store_true',
+                        help='compare atlas and per-file loading and blits')
+    args = parser.parse_args()
+
+    image_path, size = build()
+    print(f"Wrote {image_path} ({size[0]}x{size[1]}) and {ATLAS_INDEX}")
+    if args.benchmark:
+        benchmark()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,9 @@
 import pygame
-from pygame.sprite import Sprite
 
-class Bullet(Sprite):
+from assets import get_sprite_size
+from pool import PooledSprite
+
+class Bullet(PooledSprite):
     """A class to manage bullets fired from the ship"""
 
     def __init__(self, ai_game):
@@ -9,75 +11,74 @@ class Bullet(Sprite):
         super().__init__()
         self.screen = ai_game.screen
         self.settings = ai_game.settings
+        self.assets = ai_game.assets
+        self.ship = ai_game.ship
 
-        self.bullet_width = self.screen.get_rect().width * .02
-        self.bullet_height = self.screen.get_rect().height * .04
+        self.bullet_width, self.bullet_height = get_sprite_size(
+            'Images/bullet.png', self.screen.get_rect())
 
-        # Load the alien image and set its scale and rect attribute. 
-        self.image = pygame.image.load('images/bullet.png')
-        self.image = pygame.transform.scale(
-            self.image,(self.bullet_width, self.bullet_height))
+        # Get the scaled bullet image from the asset cache and set its rect.
+        self.image = self.assets.get_image(
+            'Images/bullet.png', (self.bullet_width, self.bullet_height))
         self.rect = self.image.get_rect()
+        self.mask = self.assets.get_mask(self.image)
 
 
         # Create a bullet rect at (0, 0) and then set correct position.
         self.rect = pygame.Rect(0, 0, self.bullet_width,
             self.bullet_height)
-        self.rect.midtop = ai_game.ship.rect.midtop
-
-        # Ship Lazer sound
-        self.lazer = pygame.mixer.Sound('Sounds/lazer.wav')
-        self.lazer.play()
+        self.reset()
 
+    def reset(self):
+        """Move the bullet back to the ship so it can be fired again."""
+        self.rect.midtop = self.ship.rect.midtop
 
         # Store the bullet's position as a decimal value.
         self.y = float(self.rect.y)
+        self.old_pos = None
 
-    def update(self):
+    def update(self, dt):
         """Move the bullet up the screen."""
-        self.mask = pygame.mask.from_surface(self.image)
+        self.old_pos = self.rect.topleft
         # Update the decimal position of the bullet
-        self.y -= self.settings.bullet_speed
+        self.y -= self.settings.bullet_speed * dt
         # Update the rect position
         self.rect.y = self.y
 
-class AlienBullet(Sprite):
+class AlienBullet(PooledSprite):
     """A class to manage bullets fired from the ship"""
 
-    def __init__(self, x, y):
+    def __init__(self, ai_game, x, y):
         """Create a bullet object at the ship's current position."""
         super().__init__()
+        self.assets = ai_game.assets
 
-        self.alien_bullet_speed = 2
+        # Speed in pixels per second.
+        self.alien_bullet_speed = 240.0
 
-        # Load the alien image and set its scale and rect attribute. 
-        self.image = pygame.image.load('images/alien_bullet.png')
+        # Get the alien bullet image from the asset cache and set its rect.
+        self.image = self.assets.get_image('Images/alien_bullet.png')
         # self.image = pygame.transform.scale(
         #     self.image,(self.bullet_width, self.bullet_height))
         self.rect = self.image.get_rect()
+        self.mask = self.assets.get_mask(self.image)
+        self.reset(x, y)
 
-
-        # Create a bullet rect at (0, 0) and then set correct position.
-        self.rect = pygame.Rect(0, 0, .02, .04)
-        self.rect.center = [x, y]
-
-        # Boss Ship Lazer sound
-        self.lazer = pygame.mixer.Sound('Sounds/boss.wav')
-        self.lazer.play()
-
+    def reset(self, x, y):
+        """Place the bullet at (x, y) so it can be fired again."""
+        # Place the bullet's top left corner at the firing alien's center.
+        # The rect covers the whole image so broadphase collision checks
+        # see the bullet's real extent.
+        self.rect.topleft = (x, y)
 
         # Store the bullet's position as a decimal value.
         self.y = float(self.rect.y)
+        self.old_pos = None
 
-    def update(self):
+    def update(self, dt):
         """Move the bullet up the screen."""
-        self.mask = pygame.mask.from_surface(self.image)
+        self.old_pos = self.rect.topleft
         # Update the decimal position of the bullet
-        self.y += self.alien_bullet_speed
+        self.y += self.alien_bullet_speed * dt
         # Update the rect position
         self.rect.y = self.y
-
-
-
-
-
@@ -11,7 +11,7 @@ class Button:
         self.width, self.height = 200, 50
         self.button_color = (8, 80, 128)
         self.text_color = (255, 255, 255)
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = ai_game.assets.get_font(48)
 
         # Build the button's rect object and center it.
         self.rect = pygame.Rect(0, 0, self.width, self.height)
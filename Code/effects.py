@@ -0,0 +1,111 @@
+import numpy as np
+
+from assets import EXPLOSION_FRAMES, EXPLOSION_SIZES
+
+
+class Explosions:
+    """
+    A class to play every explosion on screen from a handful of NumPy
+    arrays instead of one sprite each.
+
+    Each explosion is a position, an age, an animation frame and a size.
+    One vectorized step ages them all, and they are drawn with one batched
+    blit from the five animation frames pre-scaled for each size. At most
+    max_effects play at once; spawning another evicts the oldest.
+
+    Live explosions sit between start and end in the arrays, oldest first.
+    Every explosion lasts the same time, so the finished ones are always
+    the oldest and are dropped by moving start forward.
+    """
+
+    # Seconds each animation frame is shown for.
+    frame_time = 0.05
+
+    def __init__(self, ai_game):
+        """Allocate the arrays for up to max_effects explosions."""
+        self.assets = ai_game.assets
+        self.max_effects = ai_game.settings.max_effects
+        self.frame_count = len(EXPLOSION_FRAMES)
+        self.lifetime = self.frame_count * self.frame_time
+
+        # Twice the cap, so the live explosions are only moved back to the
+        # front once every max_effects spawns.
+        capacity = 2 * self.max_effects
+        self.x = np.zeros(capacity, np.int32)
+        self.y = np.zeros(capacity, np.int32)
+        self.age = np.zeros(capacity, np.float64)
+        self.frame = np.zeros(capacity, np.int32)
+        self.size = np.zeros(capacity, np.int32)
+        self.start = 0
+        self.end = 0
+
+        # Explosions dropped to make room for new ones.
+        self.evicted = 0
+
+        # The scaled animation frames of each size, loaded on first use.
+        self.images = {}
+
+    def __len__(self):
+        """Return the number of explosions playing."""
+        return self.end - self.start
+
+    def _get_images(self, size):
+        """Return the animation frames for explosions of size."""
+        images = self.images.get(size)
+        if images is None:
+            images = self.assets.get_images(EXPLOSION_FRAMES,
+                                            EXPLOSION_SIZES[size])
+            self.images[size] = images
+        return images
+
+    def spawn(self, x, y, size):
+        """Start an explosion of size centered on x, y."""
+        if len(self) >= self.max_effects:
+            self.start += 1
+            self.evicted += 1
+        if self.end == len(self.x):
+            self._compact()
+
+        width, height = self._get_images(size)[0].get_size()
+        slot = self.end
+        self.x[slot] = x - width // 2
+        self.y[slot] = y - height // 2
+        self.age[slot] = 0.0
+        self.frame[slot] = 0
+        self.size[slot] = size
+        self.end += 1
+
+    def _compact(self):
+        """Move the live explosions back to the front of the arrays."""
+        n = len(self)
+        for array in (self.x, self.y, self.age, self.frame, self.size):
+            array[:n] = array[self.start:self.end]
+        self.start = 0
+        self.end = n
+
+    def update(self, dt):
+        """Age every explosion and drop the ones that have finished."""
+        if not len(self):
+            return
+        live = slice(self.start, self.end)
+        age = self.age[live]
+        age += dt
+        # A little slack so a frame isn't held an extra tick when the ticks
+        # add up to a hair under frame_time.
+        np.minimum((age / self.frame_time + 1e-9).astype(np.int32),
+                   self.frame_count - 1, out=self.frame[live])
+        self.start += int(np.count_nonzero(age >= self.lifetime - 1e-9))
+        if self.start == self.end:
+            self.start = self.end = 0
+
+    def get_blits(self):
+        """Return (image, position) pairs for every explosion playing."""
+        live = slice(self.start, self.end)
+        images = self.images
+        return [(images[size][frame], (x, y)) for size, frame, x, y in zip(
+            self.size[live].tolist(), self.frame[live].tolist(),
+            self.x[live].tolist(), self.y[live].tolist())]
+
+    def empty(self):
+        """Stop every explosion."""
+        self.start = self.end = 0
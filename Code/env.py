@@ -0,0 +1,214 @@
+"""
+A Gym-style reinforcement learning interface to Alien Invasion.
+
+    env = AlienInvasionEnv(difficulty='hero')
+    observation = env.reset()
+    observation, reward, done, info = env.step(action)
+
+VectorEnv steps several games in lockstep and returns batched NumPy arrays.
+Games run headless, and nothing is drawn unless render is True. For more
+steps per second, simulate fewer, longer ticks, e.g. with
+overrides={'tick_rate': 30} and frame_skip=1.
+"""
+import numpy as np
+
+from alien_invasion import AlienInvasion
+from game_state import GAME_OVER
+from observation import FrameObserver, SymbolicObserver
+
+# (move, fire) for each action: move is -1 for left, 1 for right, 0 to stay.
+ACTIONS = [(0, False), (-1, False), (1, False),
+           (0, True), (-1, True), (1, True)]
+
+# Length of the observation vector. See AlienInvasionEnv.get_observation().
+OBSERVATION_SIZE = 12
+
+
+class AlienInvasionEnv:
+    """
+    A class to play one headless game through reset() and step(action).
+
+    Each step holds the chosen action for frame_skip simulation ticks. The
+    reward is the score gained over the step, and an episode is done at
+    game over or after max_steps steps.
+
+    observation picks what each step returns: 'vector' for a short feature
+    vector, 'pixels' for the rendered frame scaled to pixel_size, with
+    optional grayscale and a stack of the last stack frames, or 'symbolic'
+    for the position of everything in the game.
+    """
+
+    def __init__(self, difficulty='rookie', frame_skip=4, render=False,
+                 resolution=None, seed=None, max_steps=None, overrides=None,
+                 observation='vector', pixel_size=(160, 90), grayscale=False,
+                 stack=1):
+        """Create the game the environment plays."""
+        self.difficulty = difficulty
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.overrides = dict(overrides or {})
+        self.overrides['difficulty_level'] = difficulty
+
+        self.game = AlienInvasion(headless=True, seed=seed, render=render,
+                                  resolution=resolution,
+                                  overrides=self.overrides)
+        # Keep timer events to this game, so environments can share a
+        # process without stealing each other's events.
+        self.game.clock.event_queue = []
+
+        self.screen_rect = self.game.screen.get_rect()
+        self.action_count = len(ACTIONS)
+        self.steps = 0
+        self.fleet_size = 1
+
+        self.observation = observation
+        self.observer = None
+        if observation == 'pixels':
+            self.observer = FrameObserver(self.game, pixel_size, grayscale,
+                                          stack)
+        elif observation == 'symbolic':
+            self.observer = SymbolicObserver(self.game)
+        if self.observer is not None:
+            self.observation_shape = self.observer.shape
+        else:
+            self.observation_shape = (OBSERVATION_SIZE,)
+        self.observation_dtype = (np.uint8 if observation == 'pixels'
+                                  else np.float32)
+
+    def reset(self):
+        """Start a new game and return the first observation."""
+        self.game.restart(self.overrides)
+        self.game._start_game()
+        self.steps = 0
+        self.fleet_size = max(1, len(self.game.aliens))
+        if self.observation == 'pixels':
+            return self.observer.reset()
+        return self.get_observation()
+
+    def step(self, action):
+        """
+        Play action for frame_skip ticks. Return the observation, reward,
+        whether the episode is done, and a dict of extra information.
+        """
+        game = self.game
+        move, fire = ACTIONS[action]
+        game.ship.moving_left = move < 0
+        game.ship.moving_right = move > 0
+        if fire and game.stats.game_active:
+            game._fire_bullet()
+
+        score = game.stats.score
+        game.step(self.frame_skip)
+        self.steps += 1
+
+        reward = game.stats.score - score
+        game_over = game.state.state == GAME_OVER
+        truncated = (self.max_steps is not None
+                     and self.steps >= self.max_steps and not game_over)
+        info = {
+            'score': game.stats.score,
+            'level': game.stats.level,
+            'ships_left': game.stats.ships_left,
+            'truncated': truncated,
+        }
+        return (self.get_observation(), reward, game_over or truncated,
+                info)
+
+    def get_observation(self):
+        """Return the current observation of the chosen kind."""
+        if self.observer is not None:
+            return self.observer.observe()
+        return self._get_vector()
+
+    def _get_vector(self):
+        """
+        Return a float32 vector describing the game, scaled to about 0-1:
+        ship x, ship health, ships left, aliens left, fleet left, right and
+        bottom edges, nearest alien's and nearest alien bullet's offsets
+        from the ship, and whether this is a boss fight.
+        """
+        game = self.game
+        width = self.screen_rect.width
+        height = self.screen_rect.height
+        ship = game.ship.rect
+        observation = np.zeros(OBSERVATION_SIZE, np.float32)
+        observation[0] = ship.centerx / width
+        observation[1] = game.settings.ship_health / 5
+        observation[2] = game.stats.ships_left / max(1, game.settings.ship_limit)
+
+        aliens = game.aliens.sprites()
+        if aliens:
+            observation[3] = len(aliens) / self.fleet_size
+            if game.formation and game.settings.fleet_backend == 'sprite':
+                bounds = game.formation.get_rect()
+            else:
+                bounds = aliens[0].rect.unionall(
+                    [alien.rect for alien in aliens])
+            observation[4] = bounds.left / width
+            observation[5] = bounds.right / width
+            observation[6] = bounds.bottom / height
+            nearest = min(aliens, key=lambda alien: abs(
+                alien.rect.centerx - ship.centerx))
+            observation[7] = (nearest.rect.centerx - ship.centerx) / width
+            observation[8] = (ship.top - nearest.rect.bottom) / height
+
+        bullets = game.alien_bullets.sprites()
+        if bullets:
+            nearest = min(bullets, key=lambda bullet: abs(
+                bullet.rect.centerx - ship.centerx)
+                + abs(bullet.rect.bottom - ship.top))
+            observation[9] = (nearest.rect.centerx - ship.centerx) / width
+            observation[10] = (ship.top - nearest.rect.bottom) / height
+        else:
+            observation[9] = observation[10] = 1.0
+
+        observation[11] = float(game.stats.boss_beaten)
+        return observation
+
+
+class VectorEnv:
+    """
+    A class to step several environments in lockstep. Observations, rewards
+    and done flags come back as arrays with one row per environment, and an
+    environment that finishes is reset straight away.
+    """
+
+    def __init__(self, count, **kwargs):
+        """Create count environments, each with kwargs."""
+        seed = kwargs.pop('seed', None)
+        self.envs = [AlienInvasionEnv(
+            seed=None if seed is None else seed + index, **kwargs)
+            for index in range(count)]
+        self.action_count = len(ACTIONS)
+        self.observation_shape = self.envs[0].observation_shape
+        self.observation_dtype = self.envs[0].observation_dtype
+
+    def __len__(self):
+        return len(self.envs)
+
+    def reset(self):
+        """Reset every environment and return their observations."""
+        return np.stack([env.reset() for env in self.envs])
+
+    def step(self, actions):
+        """
+        Step every environment with its action. When one is done, its last
+        observation is kept in its info as 'final_observation' and the
+        returned observation is the first one of its next episode.
+        Observations are copied, so they stay valid after the next step.
+        """
+        observations = np.empty((len(self.envs),) + self.observation_shape,
+                                self.observation_dtype)
+        rewards = np.empty(len(self.envs), np.float32)
+        dones = np.empty(len(self.envs), bool)
+        infos = []
+        for index, (env, action) in enumerate(zip(self.envs, actions)):
+            observation, reward, done, info = env.step(int(action))
+            if done:
+                info['final_observation'] = np.array(observation)
+                observation = env.reset()
+            observations[index] = observation
+            rewards[index] = reward
+            dones[index] = done
+            infos.append(info)
+        return observations, rewards, dones, infos
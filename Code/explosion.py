@@ -1,37 +0,0 @@
-import pygame
-from pygame.sprite import Sprite
-
-class Explosion(Sprite):
-    def __init__(self, x, y, size):
-        super().__init__()
-        self.images = []
-        for num in range(1, 6):
-            img = pygame.image.load(f"images/exp{num}.png")
-            if size == 1:
-                img = pygame.transform.scale(img, (20, 20))
-            if size == 2:
-                img = pygame.transform.scale(img, (40, 40))
-            if size == 3:
-                img = pygame.transform.scale(img, (160, 160))
-            #add the image to the list
-            self.images.append(img)
-        self.index = 0
-        self.image = self.images[self.index]
-        self.rect = self.image.get_rect()
-        self.rect.center = [x, y]
-        self.counter = 0
-
-
-    def update(self):
-        explosion_speed = 6
-        #update explosion animation
-        self.counter += 1
-
-        if self.counter >= explosion_speed and self.index < len(self.images) - 1:
-            self.counter = 0
-            self.index += 1
-            self.image = self.images[self.index]
-
-        #if the animation is complete, delete explosion
-        if self.index >= len(self.images) - 1 and self.counter >= explosion_speed:
-            self.kill()
\ No newline at end of file
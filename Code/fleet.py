@@ -0,0 +1,152 @@
+import numpy as np
+from pygame.sprite import Group
+
+
+class ArrayFleet(Group):
+    """
+    A sprite group that keeps the fleet's positions and alive flags in NumPy
+    arrays and moves the whole fleet with vectorized operations.
+
+    The aliens are still sprites, so the group can be used anywhere the
+    rest of the game expects the aliens group. Their rects are only written
+    back from the arrays when someone asks for the sprites, e.g. for
+    collision checks.
+    """
+
+    def __init__(self, ai_game, capacity=256):
+        """Initialize the fleet arrays with room for capacity aliens."""
+        super().__init__()
+        self.settings = ai_game.settings
+        self.screen_rect = ai_game.screen.get_rect()
+
+        # One slot per alien added since the fleet was last emptied.
+        self.count = 0
+        self.members = []
+        self._allocate(capacity)
+
+        # True when the arrays have moved since the rects were last synced.
+        self.rects_stale = False
+
+    def _allocate(self, capacity):
+        """Grow the arrays to capacity slots, keeping the used slots."""
+        n = self.count
+        arrays = {}
+        for name, dtype in (('x', float), ('y', float), ('old_x', float),
+                            ('old_y', float), ('width', int), ('height', int),
+                            ('alive', bool)):
+            array = np.zeros(capacity, dtype=dtype)
+            if n:
+                array[:n] = getattr(self, name)[:n]
+            arrays[name] = array
+        for name, array in arrays.items():
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def add_internal(self, sprite, layer=None):
+        """Add sprite to the group and give it a slot in the arrays."""
+        super().add_internal(sprite, layer)
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+
+        slot = self.count
+        self.count += 1
+        sprite.fleet_index = slot
+        self.members.append(sprite)
+
+        # Like Alien.update, take the horizontal position from alien.x.
+        self.x[slot] = self.old_x[slot] = sprite.x
+        self.y[slot] = self.old_y[slot] = sprite.rect.y
+        self.width[slot] = sprite.rect.width
+        self.height[slot] = sprite.rect.height
+        self.alive[slot] = True
+
+    def remove_internal(self, sprite):
+        """Remove sprite from the group and mark its slot as dead."""
+        self.sync_rects()
+        super().remove_internal(sprite)
+        self.alive[sprite.fleet_index] = False
+        self.members[sprite.fleet_index] = None
+
+        # Reuse the arrays from the start once the fleet is gone.
+        if not self.spritedict:
+            self.count = 0
+            self.members = []
+
+    def sprites(self):
+        """Return the live aliens with their rects up to date."""
+        self.sync_rects()
+        return super().sprites()
+
+    def sync_rects(self):
+        """Copy the array positions back to each alien's rect."""
+        if not self.rects_stale:
+            return
+        self.rects_stale = False
+        n = self.count
+        slots = np.flatnonzero(self.alive[:n])
+        for slot, x, y in zip(slots.tolist(), self.x[slots].tolist(),
+                              self.y[slots].tolist()):
+            rect = self.members[slot].rect
+            rect.x = x
+            rect.y = y
+
+    def update(self, dt):
+        """Move every alien in the fleet in one vectorized step."""
+        n = self.count
+        self.old_x[:n] = self.x[:n]
+        self.old_y[:n] = self.y[:n]
+        self.x[:n] += (self.settings.alien_speed *
+                       self.settings.fleet_direction * dt)
+        self.rects_stale = True
+
+    def rect_x(self):
+        """
+        Return the x coordinate each alien's rect has, rounding the exact
+        positions the same way pygame does when a float is assigned.
+        """
+        x = self.x[:self.count]
+        return np.trunc(x + np.copysign(0.5, x))
+
+    def check_edges(self):
+        """Return True if any live alien is at an edge of the screen."""
+        alive = self.alive[:self.count]
+        if not alive.any():
+            return False
+        x = self.rect_x()[alive]
+        right = x + self.width[:self.count][alive]
+        return bool(right.max() >= self.screen_rect.right or x.min() <= 0)
+
+    def drop(self, distance):
+        """Move the whole fleet down by distance."""
+        self.y[:self.count] += distance
+        self.rects_stale = True
+
+    def check_bottom(self):
+        """Return True if any live alien has reached the bottom."""
+        alive = self.alive[:self.count]
+        if not alive.any():
+            return False
+        bottom = (self.y[:self.count] + self.height[:self.count])[alive]
+        return bool(bottom.max() >= self.screen_rect.bottom)
+
+    def collides_with(self, rect):
+        """Return True if any live alien overlaps rect."""
+        n = self.count
+        x = self.rect_x()
+        y = self.y[:n]
+        hits = ((x < rect.right) & (x + self.width[:n] > rect.left) &
+                (y < rect.bottom) & (y + self.height[:n] > rect.top))
+        return bool((hits & self.alive[:n]).any())
+
+    def get_blits(self, alpha=1.0):
+        """
+        Return (image, position) pairs for every live alien, alpha of the
+        way between its last two positions.
+        """
+        n = self.count
+        slots = np.flatnonzero(self.alive[:n])
+        x = self.old_x[slots] + (self.x[slots] - self.old_x[slots]) * alpha
+        y = self.old_y[slots] + (self.y[slots] - self.old_y[slots]) * alpha
+        members = self.members
+        return [(members[slot].image, position) for slot, position in
+                zip(slots.tolist(), zip(x.tolist(), y.tolist()))]
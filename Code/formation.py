@@ -0,0 +1,91 @@
+import pygame
+
+
+class Formation:
+    """
+    A class to index the fleet's aliens by column and row, so the fleet's
+    edges, bounding box and front line can be found without scanning every
+    alien.
+
+    Every alien in a fleet moves in lockstep, so an alien never changes
+    column or row and the aliens of a column share the same x. The
+    leftmost and rightmost live columns and the top and bottom live rows
+    are kept up to date as aliens are killed.
+    """
+
+    def __init__(self, columns, rows):
+        """Make an empty formation of columns by rows."""
+        # Live aliens in each column and each row, top and left first.
+        self.columns = [[] for _ in range(columns)]
+        self.rows = [[] for _ in range(rows)]
+        self.count = 0
+
+        # The outermost columns and rows that still have a live alien.
+        self.left = 0
+        self.right = columns - 1
+        self.top = 0
+        self.bottom = rows - 1
+
+    def __len__(self):
+        """Return the number of live aliens in the formation."""
+        return self.count
+
+    def add(self, alien, column, row):
+        """Place alien at column and row."""
+        alien.formation = self
+        alien.column = column
+        alien.row = row
+        aliens = self.columns[column]
+        index = 0
+        while index < len(aliens) and aliens[index].row < row:
+            index += 1
+        aliens.insert(index, alien)
+        self.rows[row].append(alien)
+        self.count += 1
+
+    def remove(self, alien):
+        """Take a killed alien out and move the outer columns and rows in."""
+        self.columns[alien.column].remove(alien)
+        self.rows[alien.row].remove(alien)
+        alien.formation = None
+        self.count -= 1
+        if not self.count:
+            return
+
+        # Each bound only ever moves inwards, so over a whole fleet this
+        # costs no more than one pass across the columns and rows.
+        while not self.columns[self.left]:
+            self.left += 1
+        while not self.columns[self.right]:
+            self.right -= 1
+        while not self.rows[self.top]:
+            self.top += 1
+        while not self.rows[self.bottom]:
+            self.bottom -= 1
+
+    def get_front_line(self):
+        """Return the lowest live alien of every column that has one."""
+        return [aliens[-1] for aliens in self.columns if aliens]
+
+    def get_rect(self):
+        """Return the screen rect around every live alien."""
+        left = self.columns[self.left][0].rect
+        right = self.columns[self.right][0].rect
+        top = self.rows[self.top][0].rect
+        bottom = self.rows[self.bottom][0].rect
+        return pygame.Rect(left.left, top.top, right.right - left.left,
+                           bottom.bottom - top.top)
+
+    def check_edges(self, screen_rect):
+        """Return True if the fleet is at an edge of the screen."""
+        if not self.count:
+            return False
+        left = self.columns[self.left][0].rect.left
+        right = self.columns[self.right][0].rect.right
+        return right >= screen_rect.right or left <= 0
+
+    def check_bottom(self, screen_rect):
+        """Return True if the fleet has reached the bottom of the screen."""
+        if not self.count:
+            return False
+        return self.rows[self.bottom][0].rect.bottom >= screen_rect.bottom
@@ -0,0 +1,106 @@
+import pygame
+
+
+class GameClock:
+    """
+    A class to run the game simulation at a fixed timestep while rendering
+    at a capped, independent frame rate.
+    """
+
+    def __init__(self, tick_rate, max_fps, max_frame_time=0.25):
+        """Initialize the clock with ticks per second and the render cap."""
+        self.tick_rate = tick_rate
+        self.max_fps = max_fps
+
+        # Length of one simulation tick in seconds.
+        self.dt = 1 / tick_rate
+
+        # Frames longer than this are clamped so a stall does not make the
+        # simulation try to catch up on seconds of missed ticks.
+        self.max_frame_time = max_frame_time
+
+        self.clock = pygame.time.Clock()
+        self.accumulator = 0.0
+
+        # Fraction of a tick between the last simulated state and the
+        # current time, used to interpolate sprite positions when drawing.
+        self.alpha = 0.0
+
+        # Repeating event timers that run on simulated time, keyed by event
+        # type and holding [interval, seconds until the next event].
+        self.timers = {}
+
+        # When set to a list, timer events are appended to it instead of
+        # pygame's event queue, so several games can share one process.
+        self.event_queue = None
+
+    def tick(self):
+        """
+        Wait for the next frame and return how many simulation ticks are
+        due since the last one.
+        """
+        frame_time = self.clock.tick(self.max_fps) / 1000
+        self.accumulator += min(frame_time, self.max_frame_time)
+
+        ticks = 0
+        while self.accumulator >= self.dt:
+            self.accumulator -= self.dt
+            ticks += 1
+
+        self.alpha = self.accumulator / self.dt
+        return ticks
+
+    def reset(self):
+        """Forget time spent outside the loop, e.g. during a pause."""
+        self.clock.tick()
+        self.accumulator = 0.0
+        self.alpha = 0.0
+
+    def set_timer(self, event_type, millis):
+        """
+        Post event_type every millis milliseconds of simulated time, like
+        pygame.time.set_timer. A value of 0 stops the timer.
+        """
+        if millis <= 0:
+            self.timers.pop(event_type, None)
+        else:
+            self.timers[event_type] = [millis / 1000, millis / 1000]
+
+    def clear_timers(self):
+        """Stop every event timer and drop any events they have queued."""
+        self.timers.clear()
+        if self.event_queue is not None:
+            self.event_queue.clear()
+
+    def update_timers(self):
+        """Advance the event timers by one tick and post any that are due."""
+        for event_type, timer in self.timers.items():
+            timer[1] -= self.dt
+            if timer[1] <= 1e-9:
+                timer[1] += timer[0]
+                event = pygame.event.Event(event_type)
+                if self.event_queue is not None:
+                    self.event_queue.append(event)
+                else:
+                    pygame.event.post(event)
+
+    def get_fps(self):
+        """Return the measured render frame rate."""
+        return self.clock.get_fps()
+
+
+def interpolate(sprite, alpha):
+    """
+    Return the position to draw sprite at, alpha of the way between its
+    position before the last tick and its current position.
+    """
+    x, y = sprite.rect.topleft
+    if sprite.old_pos is None:
+        return x, y
+    old_x, old_y = sprite.old_pos
+    return old_x + (x - old_x) * alpha, old_y + (y - old_y) * alpha
+
+
+def interpolated_blits(sprites, alpha):
+    """Return (image, position) pairs for drawing sprites with Surface.blits."""
+    return [(sprite.image, interpolate(sprite, alpha)) for sprite in sprites]
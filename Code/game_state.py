@@ -0,0 +1,59 @@
+# The states the game can be in.
+MENU = 'menu'
+COUNTDOWN = 'countdown'
+PLAYING = 'playing'
+LEVEL_TRANSITION = 'level_transition'
+RESPAWN = 'respawn'
+GAME_OVER = 'game_over'
+
+# States that hold the game still for a while before play carries on.
+PAUSED_STATES = (COUNTDOWN, LEVEL_TRANSITION, RESPAWN)
+
+
+class GameStateMachine:
+    """
+    A class to track which state the game is in and move it on to the next
+    one when a timed state runs out.
+
+    Timed states count down in simulated time, one tick at a time, so the
+    main loop keeps handling events and drawing frames while they run.
+    """
+
+    def __init__(self, state=MENU):
+        """Start in state with no transition pending."""
+        self.state = state
+
+        # Seconds left in the current state, and what to do when it ends.
+        self.remaining = 0.0
+        self.on_done = None
+
+    def enter(self, state, seconds=0.0, on_done=None):
+        """
+        Switch to state. If seconds is above zero, on_done is called once
+        that much simulated time has passed, otherwise it is called now.
+        """
+        self.state = state
+        self.remaining = seconds
+        self.on_done = on_done
+        if seconds <= 0:
+            self._finish()
+
+    def update(self, dt):
+        """Count the current state's timer down by dt seconds."""
+        if self.on_done is None:
+            return
+        self.remaining -= dt
+        # Allow for rounding error from adding up many small timesteps.
+        if self.remaining <= 1e-9:
+            self._finish()
+
+    def _finish(self):
+        """Run the current state's on_done callback, if it has one."""
+        on_done, self.on_done = self.on_done, None
+        self.remaining = 0.0
+        if on_done is not None:
+            on_done()
+
+    def is_paused(self):
+        """Return True while the game is held still between states."""
+        return self.state in PAUSED_STATES
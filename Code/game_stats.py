@@ -1,4 +1,7 @@
-import json
+import os
+
+from assets import BASE_DIR
+from leaderboard import Leaderboard
 
 class GameStats:
     """Track Statistics for Alien Invansion."""
@@ -12,33 +15,34 @@ class GameStats:
         self.game_active = False
         self.boss_beaten = False
 
-        # High score is accessed from the JSON file 
-        # using the get_saved_high_score() method.
-        self.high_score = self.get_saved_high_score()
-    
-    def get_saved_high_score(self):
-        """Gets high score from file, if it exists."""
-        try:
-            with open('user_scores.json') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return 0
-
-    def _check_high_score(self):
+        # Top scores for each difficulty, loaded once. Headless runs keep
+        # theirs in memory so they never touch the player's scores.
+        if self.settings.headless:
+            self.leaderboard = Leaderboard(None)
+        else:
+            self.leaderboard = Leaderboard(
+                os.path.join(BASE_DIR, 'user_scores.json'))
+        self.load_high_score()
+
+    def load_high_score(self):
+        """Show the high score for the selected difficulty."""
+        self.high_score = self.leaderboard.get_high_score(
+            self.settings.difficulty_level)
+
+    def record_score(self):
         """
-        Check if current score is higher than the saved high score and update 
-        the JSON file if it is.
+        Add the current game to the leaderboard. The file is written in the
+        background, so this never waits on the disk.
         """
-        saved_high_score = self.get_saved_high_score()
-        if self.high_score > saved_high_score:
-            with open('user_scores.json', 'w', encoding='utf-8') as f:
-                json.dump(self.high_score, f)
+        if self.score_recorded or self.score <= 0:
+            return
+        self.score_recorded = True
+        self.leaderboard.add(self.settings.difficulty_level, self.score,
+                             self.level)
 
     def reset_stats(self):
         """Initialize statistics that can change during the game."""
         self.ships_left = self.settings.ship_limit
         self.score = 0
         self.level = 1
-
-    
-
+        self.score_recorded = False
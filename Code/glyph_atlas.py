@@ -0,0 +1,63 @@
+import pygame
+
+
+class GlyphAtlas:
+    """
+    A class that renders each character of a font once and assembles
+    strings from those cached glyphs with blits, so numbers that change
+    every frame never go back through the font rasterizer.
+    """
+
+    def __init__(self, font, color, chars='0123456789,'):
+        """Render every character in chars into one atlas surface."""
+        self.font = font
+        self.color = color
+
+        # Each glyph's area within the atlas surface, keyed by character.
+        self.glyphs = {}
+        images = [font.render(char, True, color) for char in chars]
+        width = sum(image.get_width() for image in images)
+        height = max(image.get_height() for image in images)
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+
+        x = 0
+        for char, image in zip(chars, images):
+            self.surface.blit(image, (x, 0))
+            self.glyphs[char] = pygame.Rect(x, 0, image.get_width(),
+                                            image.get_height())
+            x += image.get_width()
+        self.height = height
+
+    def _get_glyph(self, char):
+        """Return a character's area, adding it to the atlas if it's new."""
+        glyph = self.glyphs.get(char)
+        if glyph is None:
+            image = self.font.render(char, True, self.color)
+            width = self.surface.get_width()
+            surface = pygame.Surface(
+                (width + image.get_width(),
+                 max(self.height, image.get_height())), pygame.SRCALPHA)
+            surface.blit(self.surface, (0, 0))
+            surface.blit(image, (width, 0))
+            self.surface = surface
+            self.height = surface.get_height()
+            glyph = pygame.Rect(width, 0, image.get_width(),
+                                image.get_height())
+            self.glyphs[char] = glyph
+        return glyph
+
+    def get_size(self, text):
+        """Return the (width, height) that text takes up when drawn."""
+        return (sum(self._get_glyph(char).width for char in text),
+                self.height)
+
+    def get_blits(self, text, topleft):
+        """Return (atlas, position, area) blits that draw text at topleft."""
+        # Look every glyph up first so the atlas surface is final.
+        glyphs = [self._get_glyph(char) for char in text]
+        x, y = topleft
+        blits = []
+        for glyph in glyphs:
+            blits.append((self.surface, (x, y), glyph))
+            x += glyph.width
+        return blits
@@ -0,0 +1,154 @@
+import json
+import os
+import threading
+import time
+
+
+class Leaderboard:
+    """
+    A class to keep the top scores for each difficulty level in memory and
+    save them to disk on a background thread.
+
+    The file is read once when the leaderboard is created. Every change
+    queues a snapshot for the writer thread, which writes it to a temporary
+    file and renames it over the old one, so a game killed mid-write never
+    leaves a half written file behind.
+    """
+
+    def __init__(self, path='user_scores.json', size=10):
+        """Load the leaderboard at path. With no path it is never saved."""
+        self.path = path
+        self.size = size
+
+        # Entries for each difficulty, best score first. Each entry is a
+        # dict with the score, the level reached and when it was set.
+        self.entries = {}
+
+        # The latest snapshot waiting to be written, if any. Older
+        # snapshots are replaced rather than queued.
+        self.pending = None
+        self.condition = threading.Condition()
+        self.writing = False
+        self.thread = None
+
+        if self.path is not None:
+            self.load()
+
+    def load(self):
+        """Read the leaderboard file, keeping what can be used of it."""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            # Keep a copy of a damaged file rather than writing over it.
+            self._set_aside()
+            return
+
+        if isinstance(data, (int, float)):
+            # Files from before the leaderboard held one high score for
+            # every difficulty. Keep it as a rookie score.
+            data = {'rookie': [{'score': data, 'level': 0, 'time': 0}]}
+        if not isinstance(data, dict):
+            self._set_aside()
+            return
+
+        for difficulty, entries in data.items():
+            if not isinstance(entries, list):
+                continue
+            for entry in entries:
+                try:
+                    self._insert(difficulty, {
+                        'score': int(entry['score']),
+                        'level': int(entry.get('level', 0)),
+                        'time': float(entry.get('time', 0)),
+                    })
+                except (TypeError, KeyError, ValueError, AttributeError):
+                    continue
+
+    def _set_aside(self):
+        """Rename an unreadable leaderboard file so it is not lost."""
+        try:
+            os.replace(self.path, self.path + '.bad')
+        except OSError:
+            pass
+
+    def _insert(self, difficulty, entry):
+        """Add entry in score order, return its rank or None if dropped."""
+        entries = self.entries.setdefault(difficulty, [])
+        rank = 0
+        while rank < len(entries) and entries[rank]['score'] >= entry['score']:
+            rank += 1
+        if rank >= self.size:
+            return None
+        entries.insert(rank, entry)
+        del entries[self.size:]
+        return rank
+
+    def add(self, difficulty, score, level):
+        """
+        Record a finished game. Return its rank on the difficulty's board,
+        counting from 0, or None if it didn't make the board.
+        """
+        rank = self._insert(difficulty, {
+            'score': score, 'level': level, 'time': time.time()})
+        if rank is not None:
+            self.save()
+        return rank
+
+    def get_entries(self, difficulty):
+        """Return the entries for difficulty, best score first."""
+        return list(self.entries.get(difficulty, []))
+
+    def get_high_score(self, difficulty):
+        """Return the best score for difficulty, or 0 if there is none."""
+        entries = self.entries.get(difficulty)
+        return entries[0]['score'] if entries else 0
+
+    def save(self):
+        """Queue the current leaderboard to be written in the background."""
+        if self.path is None:
+            return
+        snapshot = json.dumps(self.entries, indent=2)
+        with self.condition:
+            self.pending = snapshot
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run_writer,
+                                               daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+
+    def flush(self):
+        """Block until every queued snapshot has been written."""
+        with self.condition:
+            while self.pending is not None or self.writing:
+                self.condition.wait()
+
+    def _run_writer(self):
+        """Write snapshots as they are queued, newest only."""
+        while True:
+            with self.condition:
+                while self.pending is None:
+                    self.condition.wait()
+                snapshot, self.pending = self.pending, None
+                self.writing = True
+            try:
+                self._write(snapshot)
+            except OSError:
+                # Keep playing if the disk is full or read only. The next
+                # save tries again.
+                pass
+            finally:
+                with self.condition:
+                    self.writing = False
+                    self.condition.notify_all()
+
+    def _write(self, snapshot):
+        """Write snapshot to a temporary file and move it into place."""
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(snapshot)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
@@ -0,0 +1,134 @@
+import numpy as np
+import pygame
+
+
+class FrameObserver:
+    """
+    A class to turn the game's rendered frames into NumPy observations.
+
+    Each frame is drawn as usual and scaled down into a small off-screen
+    surface. The observation is a view of that surface's pixels, so nothing
+    is copied unless grayscale or frame stacking is asked for. A returned
+    view changes with the next observation; copy it to keep it.
+    """
+
+    def __init__(self, ai_game, size=(160, 90), grayscale=False, stack=1,
+                 smooth=False):
+        """Set up the off-screen surface and the arrays over it."""
+        self.ai_game = ai_game
+        self.size = size
+        self.grayscale = grayscale
+        self.stack = stack
+        self.scale = (pygame.transform.smoothscale if smooth
+                      else pygame.transform.scale)
+
+        # surfarray indexes pixels by (x, y), so transpose the view to the
+        # usual (height, width, channel) layout. The view keeps the surface
+        # locked, which transform.scale can still draw into.
+        self.surface = pygame.Surface(size, 0, 32)
+        self.pixels = pygame.surfarray.pixels3d(self.surface).transpose(1, 0, 2)
+
+        width, height = size
+        if grayscale:
+            self.gray = np.empty((height, width), np.uint8)
+            self.weights = np.array([77, 150, 29], np.uint16)
+        frame_shape = (height, width) if grayscale else (height, width, 3)
+        self.shape = frame_shape if stack == 1 else (stack,) + frame_shape
+        if stack > 1:
+            self.frames = np.zeros(self.shape, np.uint8)
+
+    def observe(self, draw=True):
+        """
+        Return the current frame. With draw False the screen is used as it
+        is, e.g. when the game has just drawn it.
+        """
+        if draw:
+            # Draw everything, whatever the renderer restored last frame.
+            self.ai_game.renderer.full_redraw = True
+            self.ai_game._draw_frame()
+        self.scale(self.ai_game.screen, self.size, self.surface)
+
+        frame = self.pixels
+        if self.grayscale:
+            # Integer luma weights that add up to 256.
+            np.right_shift(frame @ self.weights, 8, out=self.gray,
+                           casting='unsafe')
+            frame = self.gray
+        if self.stack == 1:
+            return frame
+
+        self.frames[:-1] = self.frames[1:]
+        self.frames[-1] = frame
+        return self.frames
+
+    def reset(self):
+        """Fill the frame stack with the current frame and return it."""
+        observation = self.observe()
+        if self.stack > 1:
+            self.frames[:-1] = self.frames[-1]
+        return observation
+
+
+class SymbolicObserver:
+    """
+    A class to describe the game as a fixed-size array of positions, built
+    straight from the sprite groups without drawing anything.
+
+    Row 0 is the ship, followed by max_aliens rows for aliens, max_bullets
+    for the ship's bullets and max_alien_bullets for alien bullets. Each row
+    holds a center x and y scaled to 0-1 by the screen size, and 1 if the
+    row is in use or 0 if it is padding. slices gives each group's rows.
+    """
+
+    def __init__(self, ai_game, max_aliens=64, max_bullets=16,
+                 max_alien_bullets=16):
+        """Lay out the rows for each group."""
+        self.ai_game = ai_game
+        screen_rect = ai_game.screen.get_rect()
+        self.scale = np.array([screen_rect.width, screen_rect.height],
+                              np.float32)
+
+        self.slices = {}
+        start = 1
+        for name, count in (('aliens', max_aliens), ('bullets', max_bullets),
+                            ('alien_bullets', max_alien_bullets)):
+            self.slices[name] = slice(start, start + count)
+            start += count
+        self.slices['ship'] = slice(0, 1)
+        self.shape = (start, 3)
+        self.array = np.zeros(self.shape, np.float32)
+
+    def observe(self):
+        """Return the positions of everything in the game."""
+        ai_game = self.ai_game
+        array = self.array
+        array[:] = 0
+        array[0, :2] = ai_game.ship.rect.center / self.scale
+        array[0, 2] = 1
+
+        if ai_game.settings.fleet_backend == 'array':
+            centers = self._get_fleet_centers(ai_game.aliens)
+        else:
+            centers = [alien.rect.center for alien in ai_game.aliens]
+        self._fill('aliens', centers)
+        self._fill('bullets',
+                   [bullet.rect.center for bullet in ai_game.bullets])
+        self._fill('alien_bullets',
+                   [bullet.rect.center for bullet in ai_game.alien_bullets])
+        return array
+
+    def _get_fleet_centers(self, fleet):
+        """Return the centers of an ArrayFleet's live aliens."""
+        n = fleet.count
+        alive = fleet.alive[:n]
+        x = fleet.rect_x()[alive] + fleet.width[:n][alive] / 2
+        y = fleet.y[:n][alive] + fleet.height[:n][alive] / 2
+        return np.stack([x, y], axis=1)
+
+    def _fill(self, name, centers):
+        """Write up to a group's row count of centers into its rows."""
+        rows = self.array[self.slices[name]]
+        count = min(len(centers), len(rows))
+        if count:
+            rows[:count, :2] = np.asarray(centers[:count]) / self.scale
+            rows[:count, 2] = 1
@@ -0,0 +1,78 @@
+from pygame.sprite import Sprite
+
+
+class PooledSprite(Sprite):
+    """
+    A sprite that returns itself to its pool once it has been removed from
+    every group, whether by kill(), Group.remove() or Group.empty().
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.pool = None
+        self.in_pool = False
+
+    def kill(self):
+        """Remove the sprite from all groups and return it to its pool."""
+        super().kill()
+        self._release()
+
+    def remove_internal(self, group):
+        super().remove_internal(group)
+        if not self.alive():
+            self._release()
+
+    def _release(self):
+        """Give the sprite back to its pool, if it came from one."""
+        if self.pool is not None and not self.in_pool:
+            self.pool.release(self)
+
+
+class SpritePool:
+    """
+    A class to hand out pre-allocated sprites that are reset and reused
+    instead of being constructed for every shot.
+    """
+
+    def __init__(self, factory, size=0):
+        """Initialize the pool with size sprites made by factory()."""
+        self.factory = factory
+        self.free = []
+
+        # Acquires served from the free list, and ones that had to build a
+        # new sprite because the pool was empty.
+        self.hits = 0
+        self.misses = 0
+
+        self.reserve(size)
+
+    def reserve(self, size):
+        """Build sprites until at least size are waiting in the pool."""
+        while len(self.free) < size:
+            sprite = self.factory()
+            sprite.pool = self
+            sprite.in_pool = True
+            self.free.append(sprite)
+
+    def acquire(self, *args):
+        """Return a free sprite, reset with args."""
+        if self.free:
+            sprite = self.free.pop()
+            self.hits += 1
+        else:
+            sprite = self.factory()
+            sprite.pool = self
+            self.misses += 1
+        sprite.in_pool = False
+        sprite.reset(*args)
+        return sprite
+
+    def release(self, sprite):
+        """Put a sprite that is no longer in use back in the pool."""
+        sprite.in_pool = True
+        self.free.append(sprite)
+
+    def get_stats(self):
+        """Return the pool's hit, miss and free counts."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'free': len(self.free)}
@@ -0,0 +1,150 @@
+import csv
+from collections import deque
+from time import perf_counter
+
+import pygame
+
+
+class FrameProfiler:
+    """
+    A class to time each phase of the main loop, keep the last frames in a
+    ring buffer, and show them in an on-screen overlay. While the profiler
+    is off, time() just calls the function it is given, so the game runs
+    every phase through it either way.
+    """
+
+    # Phases of the main loop, in the order they run.
+    phases = ['check_events', 'ship', 'bullets', 'aliens', 'alien_bullets',
+              'explosions', 'screen']
+
+    # Per frame counters recorded alongside the timings.
+    counters = ['aliens', 'bullets', 'alien_bullets', 'explosions',
+                'collision_pairs', 'collision_checks', 'collision_hits',
+                'dirty_percent']
+
+    def __init__(self, ai_game, size=600):
+        """Initialize the profiler with room for size frames."""
+        self.ai_game = ai_game
+        self.screen = ai_game.screen
+        self.enabled = False
+        self.show_overlay = False
+
+        # Each entry is (total_ms, {phase: ms}, {counter: value}).
+        self.frames = deque(maxlen=size)
+
+        # True while a frame is being recorded. Toggling the profiler takes
+        # effect from the next frame.
+        self.recording = False
+        self.frame_start = 0.0
+        self.timings = None
+        self.counts = None
+        self.collision_totals = (0, 0, 0)
+
+        # Overlay settings.
+        self.font = ai_game.assets.get_font(20)
+        self.text_color = (255, 255, 255)
+        self.graph_color = (0, 255, 0)
+        self.panel_color = (0, 0, 0, 160)
+        self.graph_height = 60
+        self.graph_ms = 33.3
+
+    def toggle_overlay(self):
+        """Show or hide the overlay, profiling only while it is shown."""
+        self.show_overlay = not self.show_overlay
+        self.enabled = self.show_overlay
+
+    def start_frame(self):
+        """Begin recording a new frame if the profiler is enabled."""
+        self.recording = self.enabled
+        if not self.recording:
+            return
+        self.frame_start = perf_counter()
+        self.timings = dict.fromkeys(self.phases, 0.0)
+        self.counts = dict.fromkeys(self.counters, 0)
+        self.collision_totals = self._get_collision_totals()
+
+    def time(self, phase, function, *args):
+        """Call function with args and add its run time to phase."""
+        if not self.recording:
+            return function(*args)
+        start = perf_counter()
+        result = function(*args)
+        self.timings[phase] += (perf_counter() - start) * 1000
+        return result
+
+    def end_frame(self):
+        """Finish the current frame and store it in the ring buffer."""
+        if not self.recording:
+            return
+        self.recording = False
+        self.counts['aliens'] = len(self.ai_game.aliens)
+        self.counts['bullets'] = len(self.ai_game.bullets)
+        self.counts['alien_bullets'] = len(self.ai_game.alien_bullets)
+        self.counts['explosions'] = len(self.ai_game.explosions)
+        self.counts['dirty_percent'] = round(
+            self.ai_game.renderer.dirty_fraction * 100)
+
+        # Brute force pairs, broadphase candidates and hits this frame.
+        totals = self._get_collision_totals()
+        for counter, total, start in zip(
+                ('collision_pairs', 'collision_checks', 'collision_hits'),
+                totals, self.collision_totals):
+            self.counts[counter] = total - start
+        total = (perf_counter() - self.frame_start) * 1000
+        self.frames.append((total, self.timings, self.counts))
+
+    def _get_collision_totals(self):
+        """Return the running pair, candidate and hit totals of the grids."""
+        grids = (self.ai_game.alien_grid, self.ai_game.alien_bullet_grid)
+        return (sum(grid.pairs for grid in grids),
+                sum(grid.candidates for grid in grids),
+                sum(grid.hits for grid in grids))
+
+    def draw_overlay(self):
+        """
+        Draw the frame time graph, phase timings and sprite counts, and
+        return the rect drawn on.
+        """
+        if not self.frames:
+            return None
+        total, timings, counts = self.frames[-1]
+        lines = [f"frame {total:6.2f} ms"]
+        lines += [f"{phase:<14}{timings[phase]:6.2f} ms"
+                  for phase in self.phases]
+        lines += [f"{counter:<14}{counts[counter]:6d}"
+                  for counter in self.counters]
+
+        line_height = self.font.get_linesize()
+        width = max(200, len(self.frames))
+        height = self.graph_height + line_height * len(lines) + 10
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill(self.panel_color)
+
+        # Frame time graph, one column per frame, scaled to graph_ms.
+        for x, (frame_total, _, _) in enumerate(self.frames):
+            bar = min(frame_total / self.graph_ms, 1) * self.graph_height
+            pygame.draw.line(panel, self.graph_color,
+                             (x, self.graph_height),
+                             (x, self.graph_height - bar))
+
+        y = self.graph_height + 5
+        for line in lines:
+            panel.blit(self.font.render(line, True, self.text_color), (5, y))
+            y += line_height
+
+        return self.screen.blit(
+            panel, (10, self.screen.get_rect().bottom - height - 10))
+
+    def dump_csv(self, path='profile.csv'):
+        """Write every frame in the ring buffer to a CSV file."""
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'total_ms']
+                            + [f"{phase}_ms" for phase in self.phases]
+                            + self.counters)
+            for number, (total, timings, counts) in enumerate(self.frames):
+                writer.writerow(
+                    [number, f"{total:.4f}"]
+                    + [f"{timings[phase]:.4f}" for phase in self.phases]
+                    + [counts[counter] for counter in self.counters])
+        return path
@@ -0,0 +1,173 @@
+from fractions import Fraction
+
+import pygame
+
+
+class Renderer:
+    """
+    A class to draw each frame to the screen and push it to the display.
+
+    In 'full' mode every frame redraws the whole background and flips the
+    display. In 'dirty' mode only the areas drawn on in this frame or the
+    last one are restored and pushed with pygame.display.update(rects),
+    falling back to a full redraw when the dirty area is above threshold.
+
+    When the screen is a canvas smaller or larger than the display, present
+    scales the whole canvas to the display in one pass, keeping its aspect
+    ratio and centering it between black bars. In 'dirty' mode only the
+    dirty rects are scaled and pushed.
+    """
+
+    def __init__(self, ai_game):
+        """Initialize the renderer from the game's settings."""
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+        self.display = ai_game.settings.display
+        self.screen_area = (self.screen.get_rect().width *
+                            self.screen.get_rect().height)
+
+        # Rects drawn on in the last frame and in the current one.
+        self.last_rects = []
+        self.rects = []
+
+        # Fraction of the screen pushed to the display in the last frame,
+        # counting overlapping rects more than once.
+        self.dirty_fraction = 1.0
+
+        # Where the canvas is scaled to on the display, if it is scaled.
+        self.scaled = self.screen is not self.display
+        self.viewport = self.display.get_rect()
+        if self.scaled:
+            self._fit_viewport()
+
+        # Start with a full redraw so the whole background is on screen.
+        self.full_redraw = True
+
+    def _fit_viewport(self):
+        """Fit the canvas's aspect ratio into the middle of the display."""
+        canvas = self.screen.get_rect()
+        display = self.display.get_rect()
+        scale = min(display.width / canvas.width,
+                    display.height / canvas.height)
+        self.viewport = pygame.Rect(0, 0, round(canvas.width * scale),
+                                    round(canvas.height * scale))
+        self.viewport.center = display.center
+        self.target = self.display.subsurface(self.viewport)
+        self.display.fill((0, 0, 0))
+
+        # A block of canvas pixels the size of the ratio's denominator
+        # scales to a whole number of display pixels, and scaling it on its
+        # own gives exactly the pixels scaling the whole canvas would. Dirty
+        # areas are scaled in tiles of whole blocks, at least 32 pixels.
+        self.ratio = (Fraction(self.viewport.width, canvas.width),
+                      Fraction(self.viewport.height, canvas.height))
+        self.tile_size = tuple(block * -(-32 // block) for block in (
+            self.ratio[0].denominator, self.ratio[1].denominator))
+
+    def to_canvas(self, pos):
+        """Turn a position on the display into canvas coordinates."""
+        if not self.scaled:
+            return pos
+        x = (pos[0] - self.viewport.x) * self.screen.get_width()
+        y = (pos[1] - self.viewport.y) * self.screen.get_height()
+        return x // self.viewport.width, y // self.viewport.height
+
+    def flip(self):
+        """Scale the canvas to the display if needed and show all of it."""
+        if self.scaled:
+            pygame.transform.scale(self.screen, self.viewport.size,
+                                   self.target)
+        pygame.display.flip()
+
+    def _scale_rects(self, rects):
+        """
+        Scale the areas of the canvas under rects to the display and
+        return the display rects they were drawn to.
+        """
+        # Cover the rects with tiles of whole blocks, and scale each run of
+        # tiles along a row in one call rather than every rect on its own.
+        canvas = self.screen.get_rect()
+        tile_width, tile_height = self.tile_size
+        tiles = set()
+        for rect in rects:
+            rect = rect.clip(canvas)
+            if not rect:
+                continue
+            for row in range(rect.top // tile_height,
+                             (rect.bottom - 1) // tile_height + 1):
+                for column in range(rect.left // tile_width,
+                                    (rect.right - 1) // tile_width + 1):
+                    tiles.add((row, column))
+
+        updated = []
+        run = None
+        for row, column in sorted(tiles):
+            if run and run[0] == row and run[2] == column:
+                run[2] += 1
+                continue
+            if run:
+                updated.append(self._scale_run(*run))
+            run = [row, column, column + 1]
+        if run:
+            updated.append(self._scale_run(*run))
+        return updated
+
+    def _scale_run(self, row, start, end):
+        """Scale a run of tiles in a row and return the display rect."""
+        tile_width, tile_height = self.tile_size
+        ratio_x, ratio_y = self.ratio
+        source = pygame.Rect(start * tile_width, row * tile_height,
+                             (end - start) * tile_width, tile_height)
+        source = source.clip(self.screen.get_rect())
+        dest = pygame.Rect(int(source.x * ratio_x), int(source.y * ratio_y),
+                           int(source.width * ratio_x),
+                           int(source.height * ratio_y))
+        pygame.transform.scale(self.screen.subsurface(source), dest.size,
+                               self.target.subsurface(dest))
+        return dest.move(self.viewport.topleft)
+
+    def begin(self):
+        """Clear whatever the last frame drew, ready for a new frame."""
+        self.rects = []
+        if self.settings.render_mode != 'dirty' or self.full_redraw:
+            self.screen.blit(self.settings.bg, (0, 0))
+            return
+
+        # Restore the background only where the last frame drew.
+        self.screen.blits([(self.settings.bg, rect, rect)
+                           for rect in self.last_rects], doreturn=False)
+
+    def draw(self, blits):
+        """Draw a list of (image, position) pairs and record their rects."""
+        self.rects += self.screen.blits(blits)
+
+    def add_dirty(self, rect):
+        """Record a rect that was drawn directly on the screen."""
+        if rect:
+            self.rects.append(pygame.Rect(rect))
+
+    def present(self):
+        """Push the frame to the display."""
+        if self.settings.render_mode != 'dirty':
+            self.dirty_fraction = 1.0
+            self.flip()
+            return
+
+        dirty = self.last_rects + self.rects
+        area = sum(rect.width * rect.height for rect in dirty)
+        fraction = min(area / self.screen_area, 1.0)
+
+        if self.full_redraw:
+            self.flip()
+            self.dirty_fraction = 1.0
+        elif self.scaled:
+            pygame.display.update(self._scale_rects(dirty))
+            self.dirty_fraction = fraction
+        else:
+            pygame.display.update(dirty)
+            self.dirty_fraction = fraction
+
+        # Redraw everything next frame if this one touched too much of the
+        # screen for restoring rect by rect to pay off.
+        self.full_redraw = fraction > self.settings.dirty_rect_threshold
+        self.last_rects = self.rects
@@ -0,0 +1,221 @@
+"""
+Record a game's input and replay it headless as fast as possible.
+
+Record a game by launching it with --record:
+
+    python Code/alien_invasion.py --record game.replay
+
+Replay it, printing the final stats and frame timings:
+
+    python Code/replay.py game.replay
+
+A replay file holds the RNG seed, a snapshot of the settings, and the
+simulation tick count and input events of every frame, so the same file run
+against two builds should finish with identical scores.
+"""
+import argparse
+import json
+import struct
+import time
+import zlib
+
+import pygame
+
+MAGIC = b'AIRP'
+VERSION = 2
+
+# Each frame starts with its tick count and number of events.
+FRAME_FORMAT = '<HH'
+
+# Event codes in the replay file.
+KEYDOWN, KEYUP, MOUSEBUTTONDOWN, ALIEN_SHOOT, QUIT = range(5)
+
+# Settings that describe the machine the game ran on rather than the game,
+# so a replay never copies them.
+MACHINE_SETTINGS = ('headless', 'windowed', 'virtual_resolution',
+                    'screen_width', 'screen_height', 'screen_bottom',
+                    'startup_report')
+
+
+def get_settings_snapshot(settings):
+    """Return every plain value in settings, keyed by attribute name."""
+    return {name: value for name, value in vars(settings).items()
+            if isinstance(value, (bool, int, float, str))}
+
+
+class Recorder:
+    """A class to record the events and ticks of every frame of a game."""
+
+    def __init__(self, ai_game, path):
+        """Start recording ai_game, to be saved to path."""
+        self.path = path
+        self.header = {
+            'version': VERSION,
+            'seed': ai_game.seed,
+            'resolution': ai_game.screen.get_size(),
+            'settings': get_settings_snapshot(ai_game.settings),
+        }
+        self.body = bytearray()
+        self.frames = 0
+
+        # Events seen so far in the frame being recorded.
+        self.events = []
+        self.ticks = None
+
+    def start_frame(self, ticks):
+        """Finish the last frame and start recording one of ticks ticks."""
+        self._end_frame()
+        self.ticks = ticks
+
+    def add_events(self, events):
+        """Record the events handled this frame."""
+        self.events += events
+
+    def _end_frame(self):
+        """Pack the frame being recorded into the body."""
+        if self.ticks is None:
+            return
+        packed = [_pack_event(event) for event in self.events]
+        packed = [event for event in packed if event is not None]
+        self.body += struct.pack(FRAME_FORMAT, self.ticks, len(packed))
+        for event in packed:
+            self.body += event
+        self.frames += 1
+        self.events = []
+        self.ticks = None
+
+    def save(self):
+        """Write the recording so far to the replay file."""
+        self._end_frame()
+        header = json.dumps(self.header).encode('utf-8')
+        with open(self.path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<HI', VERSION, len(header)))
+            f.write(header)
+            f.write(zlib.compress(bytes(self.body), 9))
+
+
+def _pack_event(event):
+    """Return the replay file bytes for event, or None if it isn't input."""
+    if event.type == pygame.KEYDOWN:
+        return struct.pack('<Bi', KEYDOWN, event.key)
+    if event.type == pygame.KEYUP:
+        return struct.pack('<Bi', KEYUP, event.key)
+    if event.type == pygame.MOUSEBUTTONDOWN:
+        return struct.pack('<BhhB', MOUSEBUTTONDOWN, event.pos[0],
+                           event.pos[1], event.button)
+    if event.type == pygame.USEREVENT:
+        return struct.pack('<B', ALIEN_SHOOT)
+    if event.type == pygame.QUIT:
+        return struct.pack('<B', QUIT)
+    return None
+
+
+def _unpack_event(body, offset):
+    """Return the event packed at offset in body and the offset after it."""
+    code = body[offset]
+    if code in (KEYDOWN, KEYUP):
+        key, = struct.unpack_from('<i', body, offset + 1)
+        event_type = pygame.KEYDOWN if code == KEYDOWN else pygame.KEYUP
+        return pygame.event.Event(event_type, key=key), offset + 5
+    if code == MOUSEBUTTONDOWN:
+        x, y, button = struct.unpack_from('<hhB', body, offset + 1)
+        return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(x, y),
+                                  button=button), offset + 6
+    if code == ALIEN_SHOOT:
+        return pygame.event.Event(pygame.USEREVENT), offset + 1
+    return pygame.event.Event(pygame.QUIT), offset + 1
+
+
+def load(path):
+    """Return the header and the list of (ticks, events) frames in path."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:4] != MAGIC:
+        raise ValueError(f"{path} is not an Alien Invasion replay")
+    version, header_size = struct.unpack_from('<HI', data, 4)
+    if version != VERSION:
+        raise ValueError(f"{path} is replay version {version}, "
+                         f"expected {VERSION}")
+    start = 4 + struct.calcsize('<HI')
+    header = json.loads(data[start:start + header_size].decode('utf-8'))
+    body = zlib.decompress(data[start + header_size:])
+
+    frames = []
+    offset = 0
+    while offset < len(body):
+        ticks, count = struct.unpack_from(FRAME_FORMAT, body, offset)
+        offset += struct.calcsize(FRAME_FORMAT)
+        events = []
+        for _ in range(count):
+            event, offset = _unpack_event(body, offset)
+            events.append(event)
+        frames.append((ticks, events))
+    return header, frames
+
+
+def make_game(header, render=False):
+    """Create a headless game set up like the recorded one."""
+    # Imported here so the recorder can be used from alien_invasion.
+    from alien_invasion import AlienInvasion
+
+    settings = {name: value for name, value in header['settings'].items()
+                if name not in MACHINE_SETTINGS}
+    return AlienInvasion(headless=True, seed=header['seed'], render=render,
+                         resolution=tuple(header['resolution']),
+                         overrides=settings)
+
+
+def run(path, render=False):
+    """Replay the game in path and return its final stats and timings."""
+    header, frames = load(path)
+    ai_game = make_game(header, render)
+    ai_game.replaying = True
+
+    frame_times = []
+    for ticks, events in frames:
+        start = time.perf_counter()
+        ai_game.replay_events = events
+        try:
+            ai_game.step(ticks)
+        except SystemExit:
+            # The player quit here.
+            break
+        frame_times.append(time.perf_counter() - start)
+
+    # Imported here to avoid a circular import through benchmark.
+    from benchmark import percentile
+    total = sum(frame_times) or 1e-9
+    return {
+        'frames': len(frame_times),
+        'ticks': sum(ticks for ticks, _ in frames),
+        'score': ai_game.stats.score,
+        'level': ai_game.stats.level,
+        'ships_left': ai_game.stats.ships_left,
+        'state': ai_game.state.state,
+        'fps': len(frame_times) / total,
+        'frame_ms': {
+            'p50': percentile(frame_times, 50) * 1000,
+            'p95': percentile(frame_times, 95) * 1000,
+            'p99': percentile(frame_times, 99) * 1000,
+        } if frame_times else {},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('replay', help='replay file to run')
+    parser.add_argument('--render', action='store_true',
+                        help='draw every frame as well')
+    parser.add_argument('--output', help='file to save the results to')
+    args = parser.parse_args()
+
+    results = run(args.replay, args.render)
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,7 @@
 import pygame
-from pygame.sprite import Group
 
-from ship import Ship
+from assets import get_sprite_size
+from glyph_atlas import GlyphAtlas
 
 class Scoreboard:
     """A class to report scoring information."""
@@ -10,13 +10,23 @@ class Scoreboard:
         """Initialize score-keeping attributes."""
         self.ai_game = ai_game
         self.screen = ai_game.screen
+        self.assets = ai_game.assets
         self.screen_rect = self.screen.get_rect()
         self.settings = ai_game.settings
         self.stats = ai_game.stats
 
         # Font settings for scoring information.
         self.text_color = (255, 255, 255)
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = self.assets.get_font(48)
+
+        # Digits and separators are rendered once and score strings are
+        # assembled from them, so scoring never rasterizes text.
+        self.glyphs = GlyphAtlas(self.font, self.text_color)
+
+        # One cached ship image is reused for every icon in the life counter.
+        path = 'Images/ship-medium.png'
+        self.ship_image = self.assets.get_image(
+            path, get_sprite_size(path, self.screen_rect))
 
         # Prepare the initial score images.
         self.prep_score()
@@ -28,32 +38,32 @@ class Scoreboard:
         """Turn the score into a rendered image."""
         rounded_score = round(self.stats.score, -1)
         score_str = "{:,}".format(rounded_score)
-        self.score_image = self.font.render(score_str, True,
-                self.text_color)
 
         # Display the score at the top right of the screen.
-        self.score_rect = self.score_image.get_rect()
+        self.score_rect = pygame.Rect((0, 0), self.glyphs.get_size(score_str))
         self.score_rect.right = self.screen_rect.right - 20
         self.score_rect.top = 20
+        self.score_blits = self.glyphs.get_blits(
+            score_str, self.score_rect.topleft)
 
     def prep_high_score(self):
         """Turn the high score into a rendered image."""
         high_score = round(self.stats.high_score, -1)
         high_score_str = "{:,}".format(high_score)
-        self.high_score_image = self.font.render(high_score_str, True,
-                self.text_color)
 
         # Center the high score at the top of the screen.
-        self.high_score_rect = self.high_score_image.get_rect()
+        self.high_score_rect = pygame.Rect(
+            (0, 0), self.glyphs.get_size(high_score_str))
         self.high_score_rect.centerx = self.screen_rect.centerx
         self.high_score_rect.top = self.score_rect.top
+        self.high_score_blits = self.glyphs.get_blits(
+            high_score_str, self.high_score_rect.topleft)
     
-    def show_score(self):
-        """Draw the score to the screen."""
-        self.screen.blit(self.score_image, self.score_rect)
-        self.screen.blit(self.high_score_image, self.high_score_rect)
-        self.screen.blit(self.level_image, self.level_rect)
-        self.ships.draw(self.screen)
+    def get_blits(self):
+        """Return (image, rect) pairs for everything the scoreboard shows."""
+        blits = self.score_blits + self.high_score_blits + self.level_blits
+        blits += [(self.ship_image, rect) for rect in self.ship_rects]
+        return blits
     
     def check_high_score(self):
         """Check to see if there's a new high score."""
@@ -64,19 +74,17 @@ class Scoreboard:
     def prep_level(self):
         """Turn the level into a rendered image."""
         level_str = str(self.stats.level)
-        self.level_image = self.font.render(level_str, True,
-                self.text_color)
         
         # Position the level below the score.
-        self.level_rect = self.level_image.get_rect()
+        self.level_rect = pygame.Rect((0, 0), self.glyphs.get_size(level_str))
         self.level_rect.right = self.score_rect.right
         self.level_rect.top = self.score_rect.bottom + 10
+        self.level_blits = self.glyphs.get_blits(
+            level_str, self.level_rect.topleft)
 
     def prep_ships(self):
         """Show how many ships are left."""
-        self.ships = Group()
-        for ship_number in range(self.stats.ships_left):
-            ship = Ship(self.ai_game)
-            ship.rect.x = 10 + ship_number * ship.rect.width
-            ship.rect.y = 10
-            self.ships.add(ship)
+        width = self.ship_image.get_width()
+        self.ship_rects = [
+            self.ship_image.get_rect(topleft=(10 + ship_number * width, 10))
+            for ship_number in range(self.stats.ships_left)]
@@ -4,22 +4,53 @@ import pygame
 class Settings:
     """A Class to store all settings for Alien Invasion."""
 
-    def __init__(self):
+    def __init__(self, headless=False, resolution=None, windowed=False):
         """Initialize the game's settings."""
+        # The game is drawn to a canvas of virtual_resolution whatever the
+        # display's size, and everything is placed and moved in canvas
+        # coordinates. The renderer scales the canvas to the display once
+        # a frame. Headless mode runs without a real display or audio device.
+        self.headless = headless
+        self.windowed = windowed
+        self.virtual_resolution = resolution or (1280, 720)
+
         # Screen Settings
-        self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        if self.headless or self.windowed:
+            self.display = pygame.display.set_mode(self.virtual_resolution)
+        else:
+            self.display = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        if self.display.get_size() == tuple(self.virtual_resolution):
+            # Draw straight to the display when no scaling is needed.
+            self.screen = self.display
+        else:
+            self.screen = pygame.Surface(self.virtual_resolution).convert()
         self.screen_width = self.screen.get_rect().width
         self.screen_height = self.screen.get_rect().height
         self.screen_bottom = self.screen.get_rect().bottom
 
-        # Setting Background image and scaling it to fit the current screen
-        self.bg = pygame.image.load("./images/background.jpg")
-        self.bg = pygame.transform.scale(
-            self.bg, (self.screen_width, self.screen_height))
-
-        # Assigning the background image rect
-        self.bg_rect = self.bg.get_rect()
-        self.bg_rect = self.bg_rect.move((0, 0))
+        # The background image, scaled to fit the current screen. The game
+        # loads it along with the other assets.
+        self.bg = None
+        self.bg_rect = None
+
+        # Print how long startup took once the first frame is drawn.
+        self.startup_report = False
+
+        # Frame timing. The simulation runs at a fixed number of ticks per
+        # second and rendering is capped at max_fps.
+        self.tick_rate = 120
+        self.max_fps = 120
+
+        # Seconds the game is held still for the music countdown, between
+        # levels and after losing a ship. Headless games don't wait.
+        if self.headless:
+            self.countdown_time = 0.0
+            self.level_transition_time = 0.0
+            self.respawn_time = 0.0
+        else:
+            self.countdown_time = 2.0
+            self.level_transition_time = 1.0
+            self.respawn_time = 0.5
 
         # Ship Settings
         self.ship_limit = 3
@@ -32,9 +63,26 @@ class Settings:
         self.fleet_drop_speed = 10
         self.alien_health = 0
         self.boss_health = 5
-        self.alien_bullet_speed = 4.0
+        self.alien_bullet_speed = 480.0
         self.alien_bullets_allowed = 5
 
+        # How the fleet is stored and moved: 'sprite' updates one Alien
+        # sprite at a time, 'array' moves the whole fleet with NumPy.
+        self.fleet_backend = 'sprite'
+
+        # How frames are drawn: 'full' redraws the whole screen every frame,
+        # 'dirty' only redraws what changed unless more than
+        # dirty_rect_threshold of the screen did.
+        self.render_mode = 'full'
+        self.dirty_rect_threshold = 0.5
+
+        # Cell size in pixels of the collision broadphase grid.
+        self.collision_cell_size = 64
+
+        # Most explosions that play at once, read when the game is created.
+        # Past this the oldest one is dropped to make room.
+        self.max_effects = 4096
+
         # How quickly the game speeds up
         self.speedup_scale = 1.1
 
@@ -54,14 +102,15 @@ class Settings:
         # Scoring
 
         # Three difficulty levels that increase speed and decrease ships and
-        # bullets as the difficulty level increases
+        # bullets as the difficulty level increases. Speeds are in pixels
+        # per second.
         if self.difficulty_level == 'rookie':
             self.ship_limit = 4
             self.bullets_allowed = 10
-            self.ship_speed = 2
-            self.bullet_speed = 4.0
-            self.alien_speed = 1.5
-            self.alien_bullet_speed = 4
+            self.ship_speed = 240.0
+            self.bullet_speed = 480.0
+            self.alien_speed = 180.0
+            self.alien_bullet_speed = 480.0
             self.alien_bullets_allowed = 5
             self.alien_points = 50
 
@@ -69,10 +118,10 @@ class Settings:
         elif self.difficulty_level == 'hero':
             self.ship_limit = 3
             self.bullets_allowed = 5
-            self.ship_speed = 3.0
-            self.bullet_speed = 6.0
-            self.alien_speed = 2.0
-            self.alien_bullet_speed = 6
+            self.ship_speed = 360.0
+            self.bullet_speed = 720.0
+            self.alien_speed = 240.0
+            self.alien_bullet_speed = 720.0
             self.alien_bullets_allowed = 5
             self.alien_points = 100
 
@@ -80,10 +129,10 @@ class Settings:
         elif self.difficulty_level == 'veteran':
             self.ship_limit = 2
             self.bullets_allowed = 3
-            self.ship_speed = 6.0
-            self.bullet_speed = 8.0
-            self.alien_speed = 4.0
-            self.alien_bullet_speed = 8
+            self.ship_speed = 720.0
+            self.bullet_speed = 960.0
+            self.alien_speed = 480.0
+            self.alien_bullet_speed = 960.0
             self.alien_bullets_allowed = 5
             self.alien_points = 150
 
@@ -1,6 +1,7 @@
-import pygame
 from pygame.sprite import Sprite
 
+from assets import get_sprite_size
+
 
 class Ship(Sprite):
     """A class to manage the ship."""
@@ -10,18 +11,20 @@ class Ship(Sprite):
         super().__init__()
         self.screen = ai_game.screen
         self.settings = ai_game.settings
+        self.assets = ai_game.assets
         self.screen_rect = ai_game.screen.get_rect()
 
         # Set the ship width and height to a percentage of the screen rect's
         # width and height. This allows the ship image to scale 
         # up and down between screen resolutions.
-        self.ship_width = self.screen.get_rect().width * .03
-        self.ship_height = self.screen.get_rect().height * .04
+        self.ship_width, self.ship_height = get_sprite_size(
+            'Images/ship-medium.png', self.screen_rect)
 
-        # Load the ship image and get its rect.
-        self.image = pygame.image.load('images/ship-medium.png')
-        self.image = pygame.transform.scale(self.image, (self.ship_width, self.ship_height))
+        # Get the scaled ship image from the asset cache and get its rect.
+        self.image = self.assets.get_image(
+            'Images/ship-medium.png', (self.ship_width, self.ship_height))
         self.rect = self.image.get_rect()
+        self.mask = self.assets.get_mask(self.image)
 
         # Start each new ship at the bottom center of the screen.
         self.rect.midbottom = self.screen_rect.midbottom
@@ -29,26 +32,28 @@ class Ship(Sprite):
         # Store a decimal value for the ship's horizontal position.
         self.x = float(self.rect.x)
 
+        # Position before the last update, used to interpolate drawing.
+        self.old_pos = None
+
         # Movement flag
         self.moving_right = False
         self.moving_left = False
 
-    def update(self):
+    def update(self, dt):
         """Update the ship's position based on the movement flag."""
+        self.old_pos = self.rect.topleft
+
         # Update the ship's value, not the rect.
         if self.moving_right and self.rect.right < self.screen_rect.right:
-            self.x += self.settings.ship_speed
+            self.x += self.settings.ship_speed * dt
         if self.moving_left and self.rect.left > 0:
-            self.x -= self.settings.ship_speed
+            self.x -= self.settings.ship_speed * dt
 
         # Update rect object from self.x
         self.rect.x = self.x
 
-    def blitme(self):
-        """Draw the ship at its current location."""
-        self.screen.blit(self.image, self.rect)
-
     def center_ship(self):
         """Center the ship on the screen."""
         self.rect.midbottom = self.screen_rect.midbottom
         self.x = float(self.rect.x)
+        self.old_pos = None
@@ -0,0 +1,138 @@
+import os
+
+import pygame
+
+from assets import BASE_DIR
+
+
+class SoundBank:
+    """
+    A class that decodes every sound effect once and plays them through a
+    fixed pool of reserved mixer channels. Effects can be decoded up front,
+    in the background with load(), or on first play.
+    """
+
+    # Maximum simultaneous voices and priority for each effect. When the pool
+    # is full, a new sound may steal a channel from a lower priority sound.
+    effects = {
+        'lazer': {'voices': 3, 'priority': 1},
+        'boss': {'voices': 2, 'priority': 1},
+        'alien_explode': {'voices': 3, 'priority': 2},
+        'ship_crash': {'voices': 1, 'priority': 3},
+        'start': {'voices': 1, 'priority': 3},
+        'menu_music': {'voices': 1, 'priority': 3},
+        'game_over': {'voices': 1, 'priority': 4},
+    }
+    default_effect = {'voices': 1, 'priority': 1}
+
+    def __init__(self, sound_dir='Sounds', channels=8, load=True):
+        """Reserve the channel pool and, if load is True, load all sounds."""
+        self.sound_dir = os.path.join(BASE_DIR, sound_dir)
+        self.sounds = {}
+        self.channels = []
+
+        # Name of the effect playing on each channel of the pool.
+        self.playing = {}
+
+        # Counters for how plays were handled.
+        self.played = 0
+        self.culled = 0
+        self.stolen = 0
+        self.dropped = 0
+
+        # Without a mixer (no audio device) the bank stays silent.
+        self.enabled = pygame.mixer.get_init() is not None
+        if not self.enabled:
+            return
+
+        if load:
+            for name in self.get_names():
+                self.load(name)
+
+        # Reserve the first channels so pygame never hands them out to
+        # anything other than the bank.
+        if pygame.mixer.get_num_channels() < channels:
+            pygame.mixer.set_num_channels(channels)
+        pygame.mixer.set_reserved(channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+
+    def get_names(self):
+        """Return the name of every sound effect in the sound directory."""
+        return [os.path.splitext(filename)[0]
+                for filename in sorted(os.listdir(self.sound_dir))
+                if filename.endswith('.wav')]
+
+    def load(self, name):
+        """Decode the named effect, unless it is already loaded."""
+        if self.enabled and name not in self.sounds:
+            self.sounds[name] = pygame.mixer.Sound(
+                os.path.join(self.sound_dir, name + '.wav'))
+
+    def play(self, name):
+        """Play the named sound if its voice limit and the pool allow it."""
+        if not self.enabled:
+            return
+        effect = self.effects.get(name, self.default_effect)
+
+        # Cull the play if this effect already uses all of its voices.
+        voices = [channel for channel in self.channels
+                  if channel.get_busy() and self.playing.get(channel) == name]
+        if len(voices) >= effect['voices']:
+            self.culled += 1
+            return
+
+        channel = self._find_channel(effect['priority'])
+        if channel is None:
+            self.dropped += 1
+            return
+
+        # Decode the effect now if it hasn't been loaded yet.
+        self.load(name)
+        channel.play(self.sounds[name])
+        self.playing[channel] = name
+        self.played += 1
+
+    def _find_channel(self, priority):
+        """
+        Return a free channel, or the busy channel playing the lowest
+        priority sound below priority. Return None if neither exists.
+        """
+        victim = None
+        victim_priority = priority
+        for channel in self.channels:
+            if not channel.get_busy():
+                return channel
+            playing = self.effects.get(
+                self.playing.get(channel), self.default_effect)
+            if playing['priority'] < victim_priority:
+                victim = channel
+                victim_priority = playing['priority']
+
+        if victim is not None:
+            victim.stop()
+            self.stolen += 1
+        return victim
+
+    def play_music(self, path, loops=-1):
+        """Stream background music, skipping it if the file is missing."""
+        if not self.enabled:
+            return
+        try:
+            pygame.mixer.music.load(os.path.join(BASE_DIR, path))
+        except pygame.error:
+            return
+        pygame.mixer.music.play(loops)
+
+    def stop_music(self):
+        """Stop any background music."""
+        if self.enabled:
+            pygame.mixer.music.stop()
+
+    def get_counters(self):
+        """Return how many plays were played, culled, stolen or dropped."""
+        return {
+            'played': self.played,
+            'culled': self.culled,
+            'stolen': self.stolen,
+            'dropped': self.dropped,
+        }
@@ -0,0 +1,75 @@
+class SpatialHash:
+    """
+    A uniform grid that buckets sprites by the cells their rects cover, used
+    as a broadphase so collision checks only test sprites that are nearby.
+    """
+
+    def __init__(self, cell_size):
+        """Initialize an empty grid of square cells cell_size pixels wide."""
+        self.cell_size = cell_size
+        self.cells = {}
+        self.size = 0
+
+        # Running totals: pairs a brute force check would have tested,
+        # candidate pairs the grid returned, and pairs that really collided.
+        self.pairs = 0
+        self.candidates = 0
+        self.hits = 0
+
+    def _cell_range(self, rect):
+        """Return the range of cell columns and rows that rect covers."""
+        size = self.cell_size
+        return (range(rect.left // size, (rect.right - 1) // size + 1),
+                range(rect.top // size, (rect.bottom - 1) // size + 1))
+
+    def rebuild(self, sprites):
+        """Empty the grid and insert every sprite at its current rect."""
+        self.cells = {}
+        self.size = 0
+        cells = self.cells
+        for sprite in sprites:
+            columns, rows = self._cell_range(sprite.rect)
+            for column in columns:
+                for row in rows:
+                    cell = cells.get((column, row))
+                    if cell is None:
+                        cells[(column, row)] = [sprite]
+                    else:
+                        cell.append(sprite)
+            self.size += 1
+
+    def query(self, rect):
+        """Return the sprites in every cell that rect covers, once each."""
+        cells = self.cells
+        found = {}
+        columns, rows = self._cell_range(rect)
+        for column in columns:
+            for row in rows:
+                cell = cells.get((column, row))
+                if cell:
+                    for sprite in cell:
+                        found[sprite] = None
+        return list(found)
+
+    def collide(self, sprite, dokill=False, collided=None):
+        """
+        Return the sprites in the grid that collide with sprite, like
+        pygame.sprite.spritecollide. Candidates from the grid are tested
+        against sprite's rect and then with collided, if given. Sprites
+        that were killed since the grid was built are skipped.
+        """
+        candidates = self.query(sprite.rect)
+        self.pairs += self.size
+        self.candidates += len(candidates)
+
+        hits = []
+        rect = sprite.rect
+        for candidate in candidates:
+            if not candidate.alive() or not rect.colliderect(candidate.rect):
+                continue
+            if collided is None or collided(sprite, candidate):
+                hits.append(candidate)
+                if dokill:
+                    candidate.kill()
+        self.hits += len(hits)
+        return hits